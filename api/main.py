@@ -1,47 +1,84 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
+import asyncio
+from contextlib import asynccontextmanager
+import logging
 import time
+import orjson
 import structlog
 from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
 from prometheus_client import REGISTRY
 
 from routers import issuers, scores, events, alerts, upload
 from routers import metrics as metrics_router
-from services.db import init_db
+from services.db import init_db, ping_db, get_engine, AsyncSessionLocal
 from services.config import settings
+from services.logging_queue import log_sink
+from services.response_cache import init_cache, close_cache
 
 # Configure structured logging
+LOG_LEVEL = logging.getLevelNamesMapping()[settings.LOG_LEVEL]
+
 structlog.configure(
     processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
+        structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
         structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
+        structlog.processors.JSONRenderer(serializer=orjson.dumps)
     ],
     context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
+    logger_factory=structlog.BytesLoggerFactory(file=log_sink),
+    wrapper_class=structlog.make_filtering_bound_logger(LOG_LEVEL),
     cache_logger_on_first_use=True,
 )
 
 logger = structlog.get_logger()
 
+# Set once the schema has been initialized at startup
+_db_ready = False
+
 # Prometheus metrics
 REQUEST_COUNT = Counter('http_requests_total', 'Total HTTP requests', ['method', 'endpoint', 'status'])
 REQUEST_LATENCY = Histogram('http_request_duration_seconds', 'HTTP request latency')
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize application on startup and release resources on shutdown"""
+    global _db_ready
+    log_sink.start()
+    logger.info("Starting BlackSwan Credit Intelligence API")
+    
+    # Initialize database schema and warm the connection pool
+    await init_db()
+    app.state.engine = get_engine()
+    app.state.sessionmaker = AsyncSessionLocal
+    await ping_db()
+    _db_ready = True
+    init_cache()
+    await upload.warm_openai_client()
+    
+    logger.info("API startup complete")
+    yield
+    
+    logger.info("Shutting down BlackSwan Credit Intelligence API")
+    _db_ready = False
+    await close_cache()
+    await upload.close_openai_client()
+    await app.state.engine.dispose()
+    log_sink.stop()
+
 app = FastAPI(
     title="BlackSwan Credit Intelligence API",
     description="Real-time, explainable credit scoring platform",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -54,30 +91,51 @@ app.add_middleware(
 )
 
 # Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    
-    # Record metrics
-    REQUEST_LATENCY.observe(process_time)
-    REQUEST_COUNT.labels(
-        method=request.method,
-        endpoint=request.url.path,
-        status=response.status_code
-    ).inc()
-    
-    return response
+class TimingMiddleware:
+    """Pure ASGI middleware recording request latency and the X-Process-Time header"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                process_time = time.perf_counter() - start_time
+                message.setdefault("headers", []).append(
+                    (b"x-process-time", str(process_time).encode())
+                )
+
+                # Record metrics, labelled by route template to bound cardinality
+                route = scope.get("route")
+                REQUEST_LATENCY.observe(process_time)
+                REQUEST_COUNT.labels(
+                    method=scope["method"],
+                    endpoint=route.path if route is not None else "<unmatched>",
+                    status=message["status"]
+                ).inc()
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+app.add_middleware(TimingMiddleware)
 
 # Exception handler
+_INTERNAL_ERROR_BODY = orjson.dumps({"detail": "Internal server error"})
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    logger.error("Unhandled exception", exc_info=exc, path=request.url.path)
-    return JSONResponse(
+    if LOG_LEVEL <= logging.ERROR:
+        logger.error("Unhandled exception", exc_info=exc, path=request.url.path)
+    return Response(
+        content=_INTERNAL_ERROR_BODY,
         status_code=500,
-        content={"detail": "Internal server error"}
+        media_type="application/json"
     )
 
 # Health check endpoint
@@ -85,8 +143,11 @@ async def global_exception_handler(request: Request, exc: Exception):
 async def health_check():
     """Health check endpoint for monitoring"""
     try:
+        if not _db_ready:
+            raise RuntimeError("Database not initialized")
+
         # Check database connection
-        await init_db()
+        await asyncio.wait_for(ping_db(), timeout=0.5)
         
         return {
             "status": "healthy",
@@ -110,10 +171,22 @@ async def health_check():
         )
 
 # Metrics endpoint for Prometheus
+_METRICS_TTL = 1.0
+_metrics_cache = (b"", float("-inf"))
+_metrics_lock = asyncio.Lock()
+
 @app.get("/metrics")
 async def metrics():
     """Prometheus metrics endpoint"""
-    return generate_latest(REGISTRY)
+    global _metrics_cache
+    payload, generated_at = _metrics_cache
+    if time.monotonic() - generated_at >= _METRICS_TTL:
+        async with _metrics_lock:
+            payload, generated_at = _metrics_cache
+            if time.monotonic() - generated_at >= _METRICS_TTL:
+                payload = generate_latest(REGISTRY)
+                _metrics_cache = (payload, time.monotonic())
+    return Response(content=payload, media_type=CONTENT_TYPE_LATEST)
 
 # Root endpoint
 @app.get("/")
@@ -136,25 +209,19 @@ app.include_router(alerts.router, prefix="/api/v1", tags=["alerts"])
 app.include_router(upload.router, prefix="/api/v1", tags=["upload"])
 app.include_router(metrics_router.router, prefix="/api/v1", tags=["metrics"])
 
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    """Initialize application on startup"""
-    logger.info("Starting BlackSwan Credit Intelligence API")
-    
-    # Initialize database connection
-    await init_db()
-    
-    logger.info("API startup complete")
-
-# Shutdown event
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown"""
-    logger.info("Shutting down BlackSwan Credit Intelligence API")
-
 if __name__ == "__main__":
+    import os
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        "main:app",
+        host=settings.API_HOST,
+        port=settings.API_PORT,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 2)),
+        limit_concurrency=1000,
+        timeout_keep_alive=30,
+        access_log=False,
+    )
 
 
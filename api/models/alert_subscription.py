@@ -21,18 +21,6 @@ class AlertSubscription(Base):
     def __repr__(self):
         return f"<AlertSubscription(id={self.id}, issuer_id={self.issuer_id}, threshold={self.threshold})>"
     
-    def to_dict(self):
-        """Convert model to dictionary"""
-        return {
-            "id": self.id,
-            "issuer_id": self.issuer_id,
-            "email": self.email,
-            "webhook_url": self.webhook_url,
-            "threshold": self.threshold,
-            "is_active": self.is_active,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None
-        }
 
 
 
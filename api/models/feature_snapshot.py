@@ -20,17 +20,6 @@ class FeatureSnapshot(Base):
     def __repr__(self):
         return f"<FeatureSnapshot(id={self.id}, issuer_id={self.issuer_id}, feature='{self.feature_name}', value={self.value})>"
     
-    def to_dict(self):
-        """Convert model to dictionary"""
-        return {
-            "id": self.id,
-            "issuer_id": self.issuer_id,
-            "ts": self.ts.isoformat() if self.ts else None,
-            "feature_name": self.feature_name,
-            "value": self.value,
-            "source": self.source,
-            "created_at": self.created_at.isoformat() if self.created_at else None
-        }
 
 
 
@@ -15,16 +15,6 @@ class Macro(Base):
     def __repr__(self):
         return f"<Macro(id={self.id}, key='{self.key}', value={self.value}, ts='{self.ts}')>"
     
-    def to_dict(self):
-        """Convert model to dictionary"""
-        return {
-            "id": self.id,
-            "ts": self.ts.isoformat() if self.ts else None,
-            "key": self.key,
-            "value": self.value,
-            "source": self.source,
-            "created_at": self.created_at.isoformat() if self.created_at else None
-        }
 
 
 
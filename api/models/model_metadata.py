@@ -17,18 +17,6 @@ class ModelMetadata(Base):
     def __repr__(self):
         return f"<ModelMetadata(id={self.id}, model_version='{self.model_version}', model_type='{self.model_type}')>"
     
-    def to_dict(self):
-        """Convert model to dictionary"""
-        return {
-            "id": self.id,
-            "model_version": self.model_version,
-            "model_type": self.model_type,
-            "training_date": self.training_date.isoformat() if self.training_date else None,
-            "performance_metrics": self.performance_metrics,
-            "feature_importance": self.feature_importance,
-            "hyperparameters": self.hyperparameters,
-            "created_at": self.created_at.isoformat() if self.created_at else None
-        }
 
 
 
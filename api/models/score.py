@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, DateTime, Text, ForeignKey, String
+from sqlalchemy import Column, Integer, Float, DateTime, Text, ForeignKey, String, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from services.db import Base
@@ -23,3 +23,10 @@ class Score(Base):
     
     # Relationships
     issuer = relationship("Issuer", back_populates="scores")
+    
+    __table_args__ = (
+        Index(
+            "idx_score_issuer_ts_latest", "issuer_id", ts.desc(),
+            postgresql_include=["score", "bucket", "base", "market", "event_delta", "macro_adj"],
+        ),
+    )
@@ -26,6 +26,6 @@ class TaskStatus(Base):
             "started_at": self.started_at.isoformat() if self.started_at else None,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
             "error_message": self.error_message,
-            "metadata": self.metadata,
+            "metadata": self.task_metadata,
             "created_at": self.created_at.isoformat() if self.created_at else None
         }
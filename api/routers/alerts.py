@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Body, BackgroundTasks
+from fastapi.responses import Response, ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload
+from sqlalchemy import select, insert
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
 import structlog
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 from services.db import get_db
+from services.issuer_cache import get_issuer
+from services.streaming import stream_json_list
+from services.tasks import enqueue_alert
 from models.alert_subscription import AlertSubscription
 from models.alert_history import AlertHistory
 from models.issuer import Issuer
+from schemas.records import AlertSubscriptionOut, AlertHistoryOut, encoder
 
 logger = structlog.get_logger()
 router = APIRouter()
@@ -24,10 +31,32 @@ class AlertSubscriptionResponse(BaseModel):
     status: str
     message: str
 
-@router.post("/alerts/subscribe", response_model=AlertSubscriptionResponse)
+_subscription_response_adapter = TypeAdapter(AlertSubscriptionResponse)
+
+def _subscription_response(subscription_id: int, status: str, message: str) -> Response:
+    """Serialize a subscription result straight to JSON bytes"""
+    body = AlertSubscriptionResponse.model_construct(
+        subscription_id=subscription_id, status=status, message=message
+    )
+    return Response(
+        content=_subscription_response_adapter.dump_json(body),
+        media_type="application/json"
+    )
+
+async def bulk_insert_alerts(db: AsyncSession, rows: List[dict]) -> List[int]:
+    """Insert alert history rows in a single round trip and return their ids in row order"""
+    if not rows:
+        return []
+    result = await db.execute(
+        insert(AlertHistory).returning(AlertHistory.id, sort_by_parameter_order=True),
+        rows
+    )
+    return result.scalars().all()
+
+@router.post("/alerts/subscribe", responses={200: {"model": AlertSubscriptionResponse}})
 async def subscribe_to_alerts(
     subscription: AlertSubscriptionRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Subscribe to alerts for an issuer.
@@ -35,11 +64,6 @@ async def subscribe_to_alerts(
     Requires either email or webhook_url to be provided.
     """
     try:
-        # Verify issuer exists
-        issuer = db.query(Issuer).filter(Issuer.id == subscription.issuer_id).first()
-        if not issuer:
-            raise HTTPException(status_code=404, detail="Issuer not found")
-        
         # Validate that at least one notification method is provided
         if not subscription.email and not subscription.webhook_url:
             raise HTTPException(
@@ -48,40 +72,56 @@ async def subscribe_to_alerts(
             )
         
         # Check if subscription already exists
-        existing = db.query(AlertSubscription).filter(
-            AlertSubscription.issuer_id == subscription.issuer_id,
-            AlertSubscription.email == subscription.email,
-            AlertSubscription.webhook_url == subscription.webhook_url
-        ).first()
+        result = await db.execute(
+            select(AlertSubscription).where(
+                AlertSubscription.issuer_id == subscription.issuer_id,
+                AlertSubscription.email == subscription.email,
+                AlertSubscription.webhook_url == subscription.webhook_url
+            ).limit(1)
+        )
+        existing = result.scalars().first()
         
         if existing:
             # Update existing subscription
             existing.threshold = subscription.threshold
             existing.is_active = True
-            db.commit()
+            await db.commit()
+            issuer = await get_issuer(db, subscription.issuer_id)
             
-            return AlertSubscriptionResponse(
+            return _subscription_response(
                 subscription_id=existing.id,
                 status="updated",
                 message=f"Updated existing alert subscription for {issuer.name}"
             )
         
-        # Create new subscription
-        new_subscription = AlertSubscription(
-            issuer_id=subscription.issuer_id,
-            email=subscription.email,
-            webhook_url=subscription.webhook_url,
-            threshold=subscription.threshold
+        # Create new subscription; the issuer FK doubles as the existence check
+        inserted = (
+            insert(AlertSubscription)
+            .values(
+                issuer_id=subscription.issuer_id,
+                email=subscription.email,
+                webhook_url=subscription.webhook_url,
+                threshold=subscription.threshold
+            )
+            .returning(AlertSubscription.id, AlertSubscription.issuer_id)
+            .cte("inserted")
         )
+        try:
+            result = await db.execute(
+                select(inserted.c.id, Issuer.name).join(Issuer, Issuer.id == inserted.c.issuer_id)
+            )
+            subscription_id, issuer_name = result.one()
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            if "foreign key" in str(e.orig):
+                raise HTTPException(status_code=404, detail="Issuer not found")
+            raise
         
-        db.add(new_subscription)
-        db.commit()
-        db.refresh(new_subscription)
-        
-        return AlertSubscriptionResponse(
-            subscription_id=new_subscription.id,
+        return _subscription_response(
+            subscription_id=subscription_id,
             status="created",
-            message=f"Created alert subscription for {issuer.name}"
+            message=f"Created alert subscription for {issuer_name}"
         )
         
     except HTTPException:
@@ -92,36 +132,23 @@ async def subscribe_to_alerts(
 
 @router.get("/alerts/subscriptions")
 async def list_alert_subscriptions(
-    issuer_id: Optional[int] = None,
-    db: Session = Depends(get_db)
+    issuer_id: Optional[int] = None
 ):
     """
     List alert subscriptions.
     """
     try:
-        query = db.query(AlertSubscription).join(Issuer)
+        query = select(AlertSubscription).options(
+            joinedload(AlertSubscription.issuer, innerjoin=True), raiseload("*")
+        )
         
         if issuer_id:
-            query = query.filter(AlertSubscription.issuer_id == issuer_id)
-        
-        subscriptions = query.all()
+            query = query.where(AlertSubscription.issuer_id == issuer_id)
         
-        return {
-            "subscriptions": [
-                {
-                    "id": sub.id,
-                    "issuer_id": sub.issuer_id,
-                    "issuer_name": sub.issuer.name,
-                    "email": sub.email,
-                    "webhook_url": sub.webhook_url,
-                    "threshold": sub.threshold,
-                    "is_active": sub.is_active,
-                    "created_at": sub.created_at.isoformat() if sub.created_at else None
-                }
-                for sub in subscriptions
-            ],
-            "total": len(subscriptions)
-        }
+        return await stream_json_list(
+            "subscriptions", query,
+            lambda sub: encoder.encode(AlertSubscriptionOut.from_orm(sub))
+        )
     except Exception as e:
         logger.error("Failed to list alert subscriptions", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -129,21 +156,19 @@ async def list_alert_subscriptions(
 @router.delete("/alerts/subscription/{subscription_id}")
 async def delete_alert_subscription(
     subscription_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Delete an alert subscription.
     """
     try:
-        subscription = db.query(AlertSubscription).filter(
-            AlertSubscription.id == subscription_id
-        ).first()
+        subscription = await db.get(AlertSubscription, subscription_id)
         
         if not subscription:
             raise HTTPException(status_code=404, detail="Subscription not found")
         
-        db.delete(subscription)
-        db.commit()
+        await db.delete(subscription)
+        await db.commit()
         
         return {
             "status": "deleted",
@@ -158,80 +183,83 @@ async def delete_alert_subscription(
 @router.get("/alerts/history")
 async def get_alert_history(
     issuer_id: Optional[int] = None,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    limit: int = 100
 ):
     """
     Get alert history.
     """
     try:
-        query = db.query(AlertHistory).join(Issuer)
+        query = select(AlertHistory).options(
+            joinedload(AlertHistory.issuer, innerjoin=True), raiseload("*")
+        )
         
         if issuer_id:
-            query = query.filter(AlertHistory.issuer_id == issuer_id)
+            query = query.where(AlertHistory.issuer_id == issuer_id)
         
-        alerts = query.order_by(AlertHistory.triggered_at.desc()).limit(limit).all()
-        
-        return {
-            "alerts": [
-                {
-                    "id": alert.id,
-                    "issuer_id": alert.issuer_id,
-                    "issuer_name": alert.issuer.name,
-                    "alert_type": alert.alert_type,
-                    "message": alert.message,
-                    "score_change": alert.score_change,
-                    "triggered_at": alert.triggered_at.isoformat() if alert.triggered_at else None
-                }
-                for alert in alerts
-            ],
-            "total": len(alerts)
-        }
+        return await stream_json_list(
+            "alerts", query.order_by(AlertHistory.triggered_at.desc()).limit(limit),
+            lambda alert: encoder.encode(AlertHistoryOut.from_orm(alert))
+        )
     except Exception as e:
         logger.error("Failed to get alert history", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.post("/alerts/test")
+@router.post("/alerts/test", status_code=202)
 async def test_alert(
+    background_tasks: BackgroundTasks,
     issuer_id: int = Body(..., embed=True),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Test alert functionality for an issuer.
     """
     try:
-        # Verify issuer exists
-        issuer = db.query(Issuer).filter(Issuer.id == issuer_id).first()
-        if not issuer:
-            raise HTTPException(status_code=404, detail="Issuer not found")
-        
-        # Get subscriptions for this issuer
-        subscriptions = db.query(AlertSubscription).filter(
-            AlertSubscription.issuer_id == issuer_id,
-            AlertSubscription.is_active == True
-        ).all()
-        
-        if not subscriptions:
-            return {
-                "status": "no_subscriptions",
-                "message": f"No active alert subscriptions found for {issuer.name}"
-            }
-        
-        # Create test alert
-        test_alert = AlertHistory(
-            subscription_id=subscriptions[0].id,
-            issuer_id=issuer_id,
-            alert_type="test",
-            message="This is a test alert",
-            score_change=0.0
-        )
+        async with db.begin():
+            # Get subscriptions for this issuer
+            result = await db.execute(
+                select(AlertSubscription).where(
+                    AlertSubscription.issuer_id == issuer_id,
+                    AlertSubscription.is_active == True
+                )
+            )
+            subscriptions = result.scalars().all()
+            
+            issuer = await get_issuer(db, issuer_id)
+            if not issuer:
+                raise HTTPException(status_code=404, detail="Issuer not found")
+            
+            if not subscriptions:
+                return ORJSONResponse(content={
+                    "status": "no_subscriptions",
+                    "message": f"No active alert subscriptions found for {issuer.name}"
+                })
+            
+            # Record one test alert per subscription; delivery happens on the workers
+            alerts = [
+                {
+                    "subscription_id": subscription.id,
+                    "issuer_id": issuer_id,
+                    "alert_type": "test",
+                    "message": "This is a test alert",
+                    "score_change": 0.0
+                }
+                for subscription in subscriptions
+            ]
+            alert_ids = await bulk_insert_alerts(db, alerts)
         
-        db.add(test_alert)
-        db.commit()
+        # Enqueued after the response is sent so the broker publish stays off the request path
+        for subscription, alert, alert_id in zip(subscriptions, alerts, alert_ids):
+            background_tasks.add_task(enqueue_alert, subscription.id, {
+                **alert,
+                "alert_id": alert_id,
+                "issuer_name": issuer.name,
+                "email": subscription.email,
+                "webhook_url": subscription.webhook_url
+            })
         
         return {
             "status": "test_sent",
-            "message": f"Test alert sent for {issuer.name}",
+            "message": f"Test alert queued for {issuer.name}",
             "subscriptions_count": len(subscriptions)
         }
         
@@ -1,132 +1,133 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, text
 from typing import Optional
 import structlog
 
 from services.db import get_db
 from models.event import Event
-from models.issuer import Issuer
+from schemas.records import EventOut, encoder
+from services.issuer_cache import get_issuer
+from services.streaming import stream_json_rows
+from services.response_cache import cached, NS_EVENTS, TTL_LONG, TTL_NORMAL
 
 logger = structlog.get_logger()
 router = APIRouter()
 
+# Columns serialized by EventOut; rows are encoded without building ORM instances
+_EVENT_COLUMNS = (
+    Event.id, Event.issuer_id, Event.ts, Event.type, Event.sentiment, Event.weight,
+    Event.headline, Event.url, Event.raw_hash, Event.decay_factor, Event.source,
+    Event.created_at,
+)
+
 @router.get("/events/latest")
 async def get_latest_events(
     limit: int = Query(50, le=1000, description="Maximum number of events to return"),
-    event_type: Optional[str] = Query(None, description="Filter by event type"),
-    db: Session = Depends(get_db)
+    event_type: Optional[str] = Query(None, description="Filter by event type")
 ):
     """
     Get the latest events across all issuers.
     """
     try:
-        query = db.query(Event).join(Issuer)
+        query = select(*_EVENT_COLUMNS)
         
         if event_type:
-            query = query.filter(Event.type == event_type)
+            query = query.where(Event.type == event_type)
         
-        events = query.order_by(Event.ts.desc()).limit(limit).all()
-        
-        return {
-            "events": [event.to_dict() for event in events],
-            "total": len(events)
-        }
+        return await stream_json_rows(
+            "events", query.order_by(Event.ts.desc()).limit(limit),
+            lambda row: encoder.encode(EventOut.from_orm(row))
+        )
     except Exception as e:
         logger.error("Failed to get latest events", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.get("/events/{issuer_id}")
-async def get_issuer_events(
-    issuer_id: int,
-    limit: int = Query(100, le=1000, description="Maximum number of events to return"),
-    event_type: Optional[str] = Query(None, description="Filter by event type"),
-    db: Session = Depends(get_db)
-):
-    """
-    Get events for a specific issuer.
-    """
-    try:
-        # Verify issuer exists
-        issuer = db.query(Issuer).filter(Issuer.id == issuer_id).first()
-        if not issuer:
-            raise HTTPException(status_code=404, detail="Issuer not found")
-        
-        query = db.query(Event).filter(Event.issuer_id == issuer_id)
-        
-        if event_type:
-            query = query.filter(Event.type == event_type)
-        
-        events = query.order_by(Event.ts.desc()).limit(limit).all()
-        
-        return {
-            "issuer_id": issuer_id,
-            "issuer_name": issuer.name,
-            "events": [event.to_dict() for event in events],
-            "total": len(events)
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error("Failed to get issuer events", error=str(e), issuer_id=issuer_id)
-        raise HTTPException(status_code=500, detail="Internal server error")
-
 @router.get("/events/types")
-async def get_event_types(db: Session = Depends(get_db)):
+@cached(TTL_LONG, NS_EVENTS)
+async def get_event_types(db: AsyncSession = Depends(get_db)):
     """
     Get list of all event types in the database.
     """
     try:
-        event_types = db.query(Event.type).distinct().all()
-        return {"event_types": [event_type[0] for event_type in event_types]}
+        event_types = await db.scalars(select(Event.type).distinct())
+        return {"event_types": list(event_types)}
     except Exception as e:
         logger.error("Failed to get event types", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/events/summary")
+@cached(TTL_NORMAL, NS_EVENTS)
 async def get_events_summary(
     days: int = Query(7, ge=1, le=365, description="Number of days to look back"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get summary of events over the specified period.
     """
     try:
-        # Get events in the specified period
-        events = db.query(Event).filter(
-            Event.ts >= func.now() - func.interval(f'{days} days')
-        ).all()
+        # Aggregate per type in the database
+        result = await db.execute(
+            text("""
+                SELECT type,
+                       COUNT(*) AS count,
+                       SUM(effective_weight) AS total_impact,
+                       AVG(COALESCE(sentiment, 0)) AS avg_sentiment
+                FROM event
+                WHERE ts >= NOW() - make_interval(days => :days)
+                GROUP BY type
+            """),
+            {"days": days}
+        )
         
-        # Group by type
         event_summary = {}
-        for event in events:
-            if event.type not in event_summary:
-                event_summary[event.type] = {
-                    "count": 0,
-                    "total_impact": 0.0,
-                    "avg_sentiment": 0.0
-                }
-            
-            event_summary[event.type]["count"] += 1
-            event_summary[event.type]["total_impact"] += event.effective_weight
-            event_summary[event.type]["avg_sentiment"] += event.sentiment or 0.0
-        
-        # Calculate averages
-        for event_type, summary in event_summary.items():
-            if summary["count"] > 0:
-                summary["avg_sentiment"] /= summary["count"]
-                summary["avg_impact"] = summary["total_impact"] / summary["count"]
+        total_events = 0
+        for row in result:
+            event_summary[row.type] = {
+                "count": row.count,
+                "total_impact": row.total_impact,
+                "avg_sentiment": row.avg_sentiment,
+                "avg_impact": row.total_impact / row.count
+            }
+            total_events += row.count
         
         return {
             "period_days": days,
-            "total_events": len(events),
+            "total_events": total_events,
             "event_types": event_summary
         }
     except Exception as e:
         logger.error("Failed to get events summary", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
-
-
-
-
+@router.get("/events/{issuer_id}")
+async def get_issuer_events(
+    issuer_id: int,
+    limit: int = Query(100, le=1000, description="Maximum number of events to return"),
+    event_type: Optional[str] = Query(None, description="Filter by event type"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get events for a specific issuer.
+    """
+    try:
+        # Verify issuer exists
+        issuer = await get_issuer(db, issuer_id)
+        if not issuer:
+            raise HTTPException(status_code=404, detail="Issuer not found")
+        
+        query = select(*_EVENT_COLUMNS).where(Event.issuer_id == issuer_id)
+        
+        if event_type:
+            query = query.where(Event.type == event_type)
+        
+        return await stream_json_rows(
+            "events", query.order_by(Event.ts.desc()).limit(limit),
+            lambda row: encoder.encode(EventOut.from_orm(row)),
+            issuer_id=issuer_id, issuer_name=issuer.name
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Failed to get issuer events", error=str(e), issuer_id=issuer_id)
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -1,7 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, selectinload
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import aliased, raiseload
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, text
 from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from msgspec.structs import asdict
+import orjson
 import structlog
 
 from services.db import get_db
@@ -9,17 +15,62 @@ from models.issuer import Issuer
 from models.score import Score
 from models.event import Event
 from schemas.issuer import IssuerResponse, IssuerDetailResponse, IssuerListResponse
+from schemas.records import EventOut
+from services.issuer_cache import get_issuer
+from services.response_cache import cached, NS_ISSUERS, TTL_LONG
 
 logger = structlog.get_logger()
 router = APIRouter()
 
+_iso = datetime.isoformat
+
+def _naive_utc(value: datetime) -> datetime:
+    """score/event ts columns are naive UTC; convert timestamps given with an offset"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+@lru_cache(maxsize=None)
+def _issuer_page_query(where_clause: str):
+    """Build the /issuers page query once per filter combination"""
+    return text(f"""
+        SELECT
+            i.id,
+            i.name,
+            i.ticker,
+            i.sector,
+            i.country,
+            c.score,
+            c.bucket,
+            c.ts AS score_ts,
+            p.score AS prev_score
+        FROM issuer i
+        LEFT JOIN LATERAL (
+            SELECT score, bucket, ts
+            FROM score
+            WHERE issuer_id = i.id
+            ORDER BY ts DESC
+            LIMIT 1
+        ) c ON TRUE
+        LEFT JOIN LATERAL (
+            SELECT score
+            FROM score
+            WHERE issuer_id = i.id
+            ORDER BY ts DESC
+            OFFSET 1 LIMIT 1
+        ) p ON TRUE
+        {where_clause}
+        ORDER BY i.id
+        LIMIT :limit
+    """)
+
 @router.get("/issuers", response_model=IssuerListResponse)
 async def list_issuers(
     sector: Optional[str] = Query(None, description="Filter by sector"),
     country: Optional[str] = Query(None, description="Filter by country"),
     limit: int = Query(100, le=1000, description="Maximum number of issuers to return"),
-    offset: int = Query(0, ge=0, description="Number of issuers to skip"),
-    db: Session = Depends(get_db)
+    after_id: Optional[int] = Query(None, description="Return issuers after this id (next_cursor of the previous page)"),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     List all issuers with their latest scores and changes.
@@ -27,74 +78,47 @@ async def list_issuers(
     Returns issuers with their current credit scores, 24h changes, and rating buckets.
     """
     try:
-        # Build base query
-        query = select(Issuer)
-        
-        # Apply filters
+        filters = []
+        params = {"limit": limit}
+        if after_id is not None:
+            filters.append("i.id > :after_id")
+            params["after_id"] = after_id
         if sector:
-            query = query.where(Issuer.sector == sector)
+            filters.append("i.sector = :sector")
+            params["sector"] = sector
         if country:
-            query = query.where(Issuer.country == country)
-        
-        # Apply pagination
-        query = query.limit(limit).offset(offset)
+            filters.append("i.country = :country")
+            params["country"] = country
+        where_clause = f"WHERE {' AND '.join(filters)}" if filters else ""
         
-        # Execute query
-        result = await db.execute(query)
-        issuers = result.scalars().all()
+        # Latest and previous score per issuer in a single round trip; the
+        # LATERAL lookups only run for the page of issuers being returned
+        result = await db.execute(
+            _issuer_page_query(where_clause),
+            params
+        )
         
-        # Get score changes for each issuer
         issuer_responses = []
-        for issuer in issuers:
-            # Get latest score for this issuer
-            latest_score_query = select(Score).where(Score.issuer_id == issuer.id).order_by(Score.ts.desc()).limit(1)
-            latest_score_result = await db.execute(latest_score_query)
-            latest_score = latest_score_result.scalar_one_or_none()
-            
-            # Calculate recent score change (for demo purposes)
-            score_change_24h = 0.0
-            if latest_score:
-                # Get the previous score (for demo, we'll use the 2nd most recent)
-                
-                # Find the previous score
-                previous_score_result = await db.execute(
-                    text("""
-                        SELECT score 
-                        FROM score 
-                        WHERE issuer_id = :issuer_id 
-                        AND ts < :latest_ts
-                        ORDER BY ts DESC 
-                        LIMIT 1
-                    """),
-                    {
-                        "issuer_id": issuer.id,
-                        "latest_ts": latest_score.ts
-                    }
-                )
-                previous_score_row = previous_score_result.fetchone()
-                
-                if previous_score_row:
-                    previous_score = previous_score_row[0]
-                    score_change_24h = latest_score.score - previous_score
-            
-            issuer_response = IssuerResponse(
-                id=issuer.id,
-                name=issuer.name,
-                ticker=issuer.ticker,
-                sector=issuer.sector,
-                country=issuer.country,
-                score=latest_score.score if latest_score else None,
-                bucket=latest_score.bucket if latest_score else None,
+        for row in result:
+            score_change_24h = row.score - row.prev_score if row.prev_score is not None else 0.0
+            issuer_responses.append(IssuerResponse(
+                id=row.id,
+                name=row.name,
+                ticker=row.ticker,
+                sector=row.sector,
+                country=row.country,
+                score=row.score,
+                bucket=row.bucket,
                 delta_24h=round(score_change_24h, 2) if score_change_24h else 0.0,
-                score_ts=latest_score.ts if latest_score else None
-            )
-            issuer_responses.append(issuer_response)
+                score_ts=row.score_ts
+            ))
         
         return IssuerListResponse(
             issuers=issuer_responses,
             total=len(issuer_responses),
             limit=limit,
-            offset=offset
+            # A short page is the last one
+            next_cursor=issuer_responses[-1].id if len(issuer_responses) == limit else None
         )
         
     except Exception as e:
@@ -104,7 +128,7 @@ async def list_issuers(
 @router.get("/issuer/{issuer_id}", response_model=IssuerDetailResponse)
 async def get_issuer_detail(
     issuer_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get detailed information about a specific issuer.
@@ -112,56 +136,39 @@ async def get_issuer_detail(
     Returns issuer details, latest score with explanation, and recent events.
     """
     try:
-        # Get issuer with latest score and recent events
-        issuer_query = select(Issuer).where(Issuer.id == issuer_id)
+        # Relationships are never needed here; raiseload turns an accidental lazy load into an error
+        issuer_query = select(Issuer).where(Issuer.id == issuer_id).options(raiseload("*"))
         issuer_result = await db.execute(issuer_query)
         issuer = issuer_result.scalar_one_or_none()
         if not issuer:
             raise HTTPException(status_code=404, detail="Issuer not found")
         
-        # Get latest score
-        latest_score_query = select(Score).where(Score.issuer_id == issuer_id).order_by(Score.ts.desc()).limit(1)
+        # Get latest score together with the most recent score from before 24 hours ago
+        twenty_four_hours_ago = datetime.utcnow() - timedelta(hours=24)
+        earlier = aliased(Score)
+        previous_score = select(earlier.score).where(
+            earlier.issuer_id == issuer_id,
+            earlier.ts < twenty_four_hours_ago
+        ).order_by(earlier.ts.desc()).limit(1).scalar_subquery()
+        latest_score_query = select(Score, previous_score.label("previous_score")).where(
+            Score.issuer_id == issuer_id
+        ).order_by(Score.ts.desc()).limit(1).options(raiseload("*"))
         latest_score_result = await db.execute(latest_score_query)
-        latest_score = latest_score_result.scalar_one_or_none()
+        latest_score, previous_score = latest_score_result.first() or (None, None)
         
         # Get recent events (last 7 days)
-        from datetime import datetime, timedelta
         seven_days_ago = datetime.utcnow() - timedelta(days=7)
         recent_events_query = select(Event).where(
             Event.issuer_id == issuer_id,
             Event.ts >= seven_days_ago
-        ).order_by(Event.ts.desc()).limit(10)
+        ).order_by(Event.ts.desc()).limit(10).options(raiseload("*"))
         recent_events_result = await db.execute(recent_events_query)
         recent_events = recent_events_result.scalars().all()
         
         # Calculate 24h score change
         score_change_24h = 0.0
-        if latest_score:
-            # Get score from 24 hours ago
-            from datetime import datetime, timedelta
-            
-            twenty_four_hours_ago = datetime.utcnow() - timedelta(hours=24)
-            
-            # Find the most recent score before 24 hours ago
-            previous_score_result = await db.execute(
-                text("""
-                    SELECT score 
-                    FROM score 
-                    WHERE issuer_id = :issuer_id 
-                    AND ts < :twenty_four_hours_ago
-                    ORDER BY ts DESC 
-                    LIMIT 1
-                """),
-                {
-                    "issuer_id": issuer_id,
-                    "twenty_four_hours_ago": twenty_four_hours_ago
-                }
-            )
-            previous_score_row = previous_score_result.fetchone()
-            
-            if previous_score_row:
-                previous_score = previous_score_row[0]
-                score_change_24h = latest_score.score - previous_score
+        if latest_score and previous_score is not None:
+            score_change_24h = latest_score.score - previous_score
         
         return IssuerDetailResponse(
             id=issuer.id,
@@ -184,7 +191,7 @@ async def get_issuer_detail(
                 {"name": "Event Impact", "impact": latest_score.event_delta if latest_score else 0.0},
                 {"name": "Macro Adjustment", "impact": latest_score.macro_adj if latest_score else 0.0}
             ] if latest_score else [],
-            events=[event.to_dict() for event in recent_events],
+            events=[asdict(EventOut.from_orm(event)) for event in recent_events],
             score_ts=latest_score.ts if latest_score else None
         )
         
@@ -197,10 +204,10 @@ async def get_issuer_detail(
 @router.get("/issuer/{issuer_id}/timeline")
 async def get_issuer_timeline(
     issuer_id: int,
-    from_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
-    to_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    from_date: Optional[datetime] = Query(None, description="Start date (YYYY-MM-DD or ISO timestamp)"),
+    to_date: Optional[datetime] = Query(None, description="End date (YYYY-MM-DD or ISO timestamp)"),
     limit: int = Query(100, le=1000, description="Maximum number of data points"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get historical timeline for an issuer.
@@ -209,57 +216,66 @@ async def get_issuer_timeline(
     """
     try:
         # Verify issuer exists
-        issuer = db.query(Issuer).filter(Issuer.id == issuer_id).first()
+        issuer = await get_issuer(db, issuer_id)
         if not issuer:
             raise HTTPException(status_code=404, detail="Issuer not found")
         
-        # Build score query
-        score_query = db.query(Score).filter(Score.issuer_id == issuer_id)
-        
-        # Apply date filters
-        if from_date:
-            score_query = score_query.filter(Score.ts >= from_date)
-        if to_date:
-            score_query = score_query.filter(Score.ts <= to_date)
-        
-        scores = score_query.order_by(Score.ts.desc()).limit(limit).all()
-        
-        # Build event query
-        event_query = db.query(Event).filter(Event.issuer_id == issuer_id)
-        
+        # Same date filters apply to both branches
+        params = {"issuer_id": issuer_id, "limit": limit}
+        filters = "issuer_id = :issuer_id"
         if from_date:
-            event_query = event_query.filter(Event.ts >= from_date)
+            filters += " AND ts >= :from_date"
+            params["from_date"] = _naive_utc(from_date)
         if to_date:
-            event_query = event_query.filter(Event.ts <= to_date)
+            filters += " AND ts <= :to_date"
+            params["to_date"] = _naive_utc(to_date)
         
-        events = event_query.order_by(Event.ts.desc()).limit(limit).all()
+        # Merge newest scores and events in SQL; each branch stops at :limit rows
+        result = await db.execute(
+            text(f"""
+                (SELECT d.ts, 'score' AS type, row_to_json(d)::text AS data
+                 FROM (
+                     SELECT id, issuer_id, ts, score, bucket, base, market, event_delta,
+                            macro_adj, model_version, explanation::text AS explanation
+                     FROM score
+                     WHERE {filters}
+                     ORDER BY ts DESC
+                     LIMIT :limit
+                 ) d)
+                UNION ALL
+                (SELECT d.ts, 'event' AS type, row_to_json(d)::text AS data
+                 FROM (
+                     SELECT id, issuer_id, ts, type, sentiment, weight, headline, url,
+                            raw_hash, decay_factor, source, created_at
+                     FROM event
+                     WHERE {filters}
+                     ORDER BY ts DESC
+                     LIMIT :limit
+                 ) d)
+                ORDER BY ts DESC
+                LIMIT :limit
+            """),
+            params
+        )
         
-        # Combine and sort by timestamp
+        # Postgres already rendered each row as JSON; embed it without re-parsing
         timeline = []
-        
-        for score in scores:
+        total_scores = 0
+        for row in result:
             timeline.append({
-                "ts": score.ts.isoformat(),
-                "type": "score",
-                "data": score.to_dict()
+                "ts": _iso(row.ts),
+                "type": row.type,
+                "data": orjson.Fragment(row.data)
             })
+            if row.type == "score":
+                total_scores += 1
         
-        for event in events:
-            timeline.append({
-                "ts": event.ts.isoformat(),
-                "type": "event",
-                "data": event.to_dict()
-            })
-        
-        # Sort by timestamp (newest first)
-        timeline.sort(key=lambda x: x["ts"], reverse=True)
-        
-        return {
+        return ORJSONResponse({
             "issuer_id": issuer_id,
-            "timeline": timeline[:limit],
-            "total_scores": len(scores),
-            "total_events": len(events)
-        }
+            "timeline": timeline,
+            "total_scores": total_scores,
+            "total_events": len(timeline) - total_scores
+        })
         
     except HTTPException:
         raise
@@ -268,7 +284,7 @@ async def get_issuer_timeline(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/{issuer_id}/history")
-async def get_issuer_score_history(issuer_id: int, db: Session = Depends(get_db)):
+async def get_issuer_score_history(issuer_id: int, db: AsyncSession = Depends(get_db)):
     """Get score history for an issuer (for charts)"""
     try:
         # Get score history
@@ -296,7 +312,7 @@ async def get_issuer_score_history(issuer_id: int, db: Session = Depends(get_db)
         score_history = []
         for score in scores:
             score_history.append({
-                "ts": score.ts.isoformat() if score.ts else None,
+                "ts": score.ts,
                 "score": float(score.score) if score.score else 0.0,
                 "bucket": score.bucket,
                 "base": float(score.base) if score.base else 0.0,
@@ -312,25 +328,31 @@ async def get_issuer_score_history(issuer_id: int, db: Session = Depends(get_db)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/sectors")
-async def list_sectors(db: Session = Depends(get_db)):
+@cached(TTL_LONG, NS_ISSUERS)
+async def list_sectors(db: AsyncSession = Depends(get_db)):
     """
     Get list of all sectors in the database.
     """
     try:
-        sectors = db.query(Issuer.sector).distinct().filter(Issuer.sector.isnot(None)).all()
-        return {"sectors": [sector[0] for sector in sectors]}
+        sectors = await db.scalars(
+            select(Issuer.sector).distinct().where(Issuer.sector.isnot(None))
+        )
+        return {"sectors": list(sectors)}
     except Exception as e:
         logger.error("Failed to list sectors", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/countries")
-async def list_countries(db: Session = Depends(get_db)):
+@cached(TTL_LONG, NS_ISSUERS)
+async def list_countries(db: AsyncSession = Depends(get_db)):
     """
     Get list of all countries in the database.
     """
     try:
-        countries = db.query(Issuer.country).distinct().filter(Issuer.country.isnot(None)).all()
-        return {"countries": [country[0] for country in countries]}
+        countries = await db.scalars(
+            select(Issuer.country).distinct().where(Issuer.country.isnot(None))
+        )
+        return {"countries": list(countries)}
     except Exception as e:
         logger.error("Failed to list countries", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
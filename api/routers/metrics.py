@@ -3,100 +3,75 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text, func
 from typing import List, Dict, Any
 from services.db import get_db
+from services.response_cache import cached, NS_SCORES, TTL_NORMAL, TTL_SHORT
 
 router = APIRouter()
 
+# Hot /metrics queries, built once at import
+_MOVERS_SQL = text("""
+    SELECT 
+        COUNT(*) FILTER (WHERE c.score > p.score) AS improving,
+        COUNT(*) FILTER (WHERE c.score < p.score) AS declining,
+        -- Alert if significant change (more than 5 points)
+        COUNT(*) FILTER (WHERE ABS(c.score - p.score) >= 5) AS alerts,
+        AVG(c.score) AS avg_score
+    FROM issuer i
+    JOIN LATERAL (
+        SELECT score
+        FROM score
+        WHERE issuer_id = i.id
+        ORDER BY ts DESC
+        LIMIT 1
+    ) c ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT score
+        FROM score
+        WHERE issuer_id = i.id
+        ORDER BY ts DESC
+        OFFSET 1 LIMIT 1
+    ) p ON TRUE
+""")
+
+_SECTOR_DISTRIBUTION_SQL = text("""
+    SELECT i.sector, COUNT(*) as count
+    FROM issuer i
+    GROUP BY i.sector
+    ORDER BY count DESC
+""")
+
+_SCORE_DISTRIBUTION_SQL = text("""
+    SELECT bucket, COUNT(*) as count
+    FROM mv_latest_score
+    GROUP BY bucket
+    ORDER BY bucket
+""")
+
 @router.get("/metrics")
+@cached(TTL_NORMAL, NS_SCORES)
 async def get_metrics(db: AsyncSession = Depends(get_db)) -> Dict[str, Any]:
     """Get dashboard metrics and analytics"""
     try:
-        # Get total issuers
-        result = await db.execute(text("SELECT COUNT(*) FROM issuer"))
-        total_issuers = result.scalar_one()
-
-        # Get last 2 scores per issuer to calculate deltas properly
-        result = await db.execute(text("""
-            WITH ranked_scores AS (
-                SELECT 
-                    issuer_id,
-                    score,
-                    bucket,
-                    ts,
-                    ROW_NUMBER() OVER (PARTITION BY issuer_id ORDER BY ts DESC) as rn
-                FROM score
-            )
-            SELECT 
-                current_scores.issuer_id,
-                current_scores.score,
-                current_scores.bucket,
-                current_scores.ts,
-                previous_scores.score as prev_score
-            FROM (
-                SELECT * FROM ranked_scores WHERE rn = 1
-            ) current_scores
-            LEFT JOIN (
-                SELECT * FROM ranked_scores WHERE rn = 2
-            ) previous_scores ON current_scores.issuer_id = previous_scores.issuer_id
-            ORDER BY current_scores.issuer_id
-        """))
-        latest_scores = result.fetchall()
-
-        # Calculate metrics
-        improving = 0
-        declining = 0
-        alerts = 0
-        total_score = 0
-        valid_scores = 0
-
-        for row in latest_scores:
-            score = row.score
-            prev_score = row.prev_score
-            
-            if score is not None:
-                total_score += score
-                valid_scores += 1
-                
-                if prev_score is not None:
-                    delta = score - prev_score
-                    if delta > 0:
-                        improving += 1
-                    elif delta < 0:
-                        declining += 1
-                    
-                    # Alert if significant change (more than 5 points)
-                    if abs(delta) >= 5:
-                        alerts += 1
-
-        avg_score = total_score / valid_scores if valid_scores > 0 else 0
+        # Compare the last 2 scores per issuer and count the movers in one row;
+        # each LATERAL lookup is a short descent of idx_score_issuer_ts_latest
+        result = await db.execute(_MOVERS_SQL)
+        movers = result.one()
+        avg_score = movers.avg_score or 0
 
         # Get sector distribution
-        result = await db.execute(text("""
-            SELECT i.sector, COUNT(*) as count
-            FROM issuer i
-            GROUP BY i.sector
-            ORDER BY count DESC
-        """))
+        result = await db.execute(_SECTOR_DISTRIBUTION_SQL)
         sector_distribution = [{"sector": row.sector, "count": row.count} for row in result.fetchall()]
+        # Every issuer falls in exactly one sector group (NULL included)
+        total_issuers = sum(row["count"] for row in sector_distribution)
 
-        # Get score distribution (buckets)
-        result = await db.execute(text("""
-            SELECT s.bucket, COUNT(*) as count
-            FROM score s
-            INNER JOIN (
-                SELECT issuer_id, MAX(ts) as max_ts
-                FROM score
-                GROUP BY issuer_id
-            ) latest ON s.issuer_id = latest.issuer_id AND s.ts = latest.max_ts
-            GROUP BY s.bucket
-            ORDER BY s.bucket
-        """))
+        # Get score distribution (buckets) from the periodically refreshed view
+        result = await db.execute(_SCORE_DISTRIBUTION_SQL)
         score_distribution = [{"bucket": row.bucket, "count": row.count} for row in result.fetchall()]
 
         return {
             "total_issuers": total_issuers,
-            "improving": improving,
-            "declining": declining,
-            "alerts": alerts,
+            "improving": movers.improving,
+            "declining": movers.declining,
+            "alerts": movers.alerts,
             "avg_score": round(avg_score, 1),
             "sector_distribution": sector_distribution,
             "score_distribution": score_distribution
@@ -113,11 +88,13 @@ async def get_sector_metrics(sector: str, db: AsyncSession = Depends(get_db)) ->
         result = await db.execute(text("""
             SELECT i.id, i.name, i.ticker, s.score, s.bucket, s.ts
             FROM issuer i
-            LEFT JOIN (
-                SELECT issuer_id, score, bucket, ts,
-                       ROW_NUMBER() OVER (PARTITION BY issuer_id ORDER BY ts DESC) as rn
+            LEFT JOIN LATERAL (
+                SELECT score, bucket, ts
                 FROM score
-            ) s ON i.id = s.issuer_id AND s.rn = 1
+                WHERE issuer_id = i.id
+                ORDER BY ts DESC
+                LIMIT 1
+            ) s ON TRUE
             WHERE i.sector = :sector
         """), {"sector": sector})
         
@@ -126,7 +103,7 @@ async def get_sector_metrics(sector: str, db: AsyncSession = Depends(get_db)) ->
         if not issuers:
             raise HTTPException(status_code=404, detail=f"No issuers found in sector: {sector}")
 
-        # Calculate sector metrics
+        # Calculate sector metrics over the issuers that have a score
         total_score = 0
         valid_scores = 0
         bucket_counts = {}
@@ -135,9 +112,7 @@ async def get_sector_metrics(sector: str, db: AsyncSession = Depends(get_db)) ->
             if row.score is not None:
                 total_score += row.score
                 valid_scores += 1
-                
-                bucket = row.bucket
-                bucket_counts[bucket] = bucket_counts.get(bucket, 0) + 1
+                bucket_counts[row.bucket] = bucket_counts.get(row.bucket, 0) + 1
 
         avg_score = total_score / valid_scores if valid_scores > 0 else 0
 
@@ -164,6 +139,7 @@ async def get_sector_metrics(sector: str, db: AsyncSession = Depends(get_db)) ->
         raise HTTPException(status_code=500, detail=f"Error fetching sector metrics: {str(e)}")
 
 @router.get("/metrics/trends")
+@cached(TTL_SHORT, NS_SCORES)
 async def get_trends(db: AsyncSession = Depends(get_db)) -> Dict[str, Any]:
     """Get trend analysis for the last 7 days"""
     try:
@@ -1,125 +1,150 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, text
 from typing import Optional
 import structlog
 
 from services.db import get_db
 from models.score import Score
-from models.issuer import Issuer
+from schemas.records import ScoreOut, encoder
+from services.issuer_cache import get_issuer
+from services.streaming import stream_json_rows
+from services.response_cache import cached, NS_SCORES, TTL_NORMAL
 
 logger = structlog.get_logger()
 router = APIRouter()
 
+# Columns serialized by ScoreOut
+_SCORE_COLUMNS = (
+    "s.id, s.issuer_id, s.ts, s.score, s.bucket, s.base, s.market, "
+    "s.event_delta, s.macro_adj, s.model_version, s.explanation"
+)
+
 @router.get("/scores/latest")
 async def get_latest_scores(
     limit: int = Query(50, le=1000, description="Maximum number of scores to return"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get the latest scores for all issuers.
     """
     try:
         # Get latest score for each issuer
-        latest_scores = db.query(Score).join(Issuer).filter(
-            Score.ts == db.query(func.max(Score.ts)).filter(
-                Score.issuer_id == Issuer.id
-            ).scalar_subquery()
-        ).limit(limit).all()
+        result = await db.execute(
+            text(f"""
+                SELECT DISTINCT ON (s.issuer_id) {_SCORE_COLUMNS}
+                FROM score s
+                ORDER BY s.issuer_id, s.ts DESC
+                LIMIT :limit
+            """),
+            {"limit": limit}
+        )
+        latest_scores = result.all()
+        
+        return Response(
+            content=encoder.encode({
+                "scores": [ScoreOut.from_orm(score) for score in latest_scores],
+                "total": len(latest_scores)
+            }),
+            media_type="application/json"
+        )
+    except Exception as e:
+        logger.error("Failed to get latest scores", error=str(e))
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/scores/buckets")
+@cached(TTL_NORMAL, NS_SCORES)
+async def get_score_buckets(db: AsyncSession = Depends(get_db)):
+    """
+    Get score distribution by rating buckets.
+    """
+    try:
+        # Bucket of each issuer's latest score, from the periodically refreshed view
+        result = await db.execute(text("""
+            SELECT bucket, COUNT(*) AS count
+            FROM mv_latest_score
+            GROUP BY bucket
+        """))
+        
+        buckets = {}
+        for bucket, count in result:
+            if bucket:
+                buckets[bucket] = count
         
         return {
-            "scores": [score.to_dict() for score in latest_scores],
-            "total": len(latest_scores)
+            "buckets": buckets,
+            "total_issuers": sum(buckets.values())
         }
     except Exception as e:
-        logger.error("Failed to get latest scores", error=str(e))
+        logger.error("Failed to get score buckets", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/scores/{issuer_id}")
 async def get_issuer_scores(
     issuer_id: int,
     limit: int = Query(100, le=1000, description="Maximum number of scores to return"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get historical scores for a specific issuer.
     """
     try:
         # Verify issuer exists
-        issuer = db.query(Issuer).filter(Issuer.id == issuer_id).first()
+        issuer = await get_issuer(db, issuer_id)
         if not issuer:
             raise HTTPException(status_code=404, detail="Issuer not found")
         
-        # Get scores
-        scores = db.query(Score).filter(
+        # Stream scores
+        query = select(
+            Score.id, Score.issuer_id, Score.ts, Score.score, Score.bucket,
+            Score.base, Score.market, Score.event_delta, Score.macro_adj,
+            Score.model_version, Score.explanation,
+        ).where(
             Score.issuer_id == issuer_id
-        ).order_by(Score.ts.desc()).limit(limit).all()
+        ).order_by(Score.ts.desc()).limit(limit)
         
-        return {
-            "issuer_id": issuer_id,
-            "issuer_name": issuer.name,
-            "scores": [score.to_dict() for score in scores],
-            "total": len(scores)
-        }
+        return await stream_json_rows(
+            "scores", query,
+            lambda row: encoder.encode(ScoreOut.from_orm(row)),
+            issuer_id=issuer_id, issuer_name=issuer.name
+        )
     except HTTPException:
         raise
     except Exception as e:
         logger.error("Failed to get issuer scores", error=str(e), issuer_id=issuer_id)
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.get("/scores/buckets")
-async def get_score_buckets(db: Session = Depends(get_db)):
-    """
-    Get score distribution by rating buckets.
-    """
-    try:
-        # Get latest scores and group by bucket
-        latest_scores = db.query(Score.bucket, func.count(Score.id)).join(
-            db.query(Score.issuer_id, func.max(Score.ts).label('max_ts')).group_by(Score.issuer_id).subquery()
-        ).filter(
-            Score.ts == func.max(Score.ts)
-        ).group_by(Score.bucket).all()
-        
-        buckets = {}
-        for bucket, count in latest_scores:
-            if bucket:
-                buckets[bucket] = count
-        
-        return {
-            "buckets": buckets,
-            "total_issuers": sum(buckets.values())
-        }
-    except Exception as e:
-        logger.error("Failed to get score buckets", error=str(e))
-        raise HTTPException(status_code=500, detail="Internal server error")
-
 @router.get("/scores/sector/{sector}")
 async def get_sector_scores(
     sector: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get latest scores for all issuers in a specific sector.
     """
     try:
         # Get latest scores for sector
-        latest_scores = db.query(Score).join(Issuer).filter(
-            Issuer.sector == sector,
-            Score.ts == db.query(func.max(Score.ts)).filter(
-                Score.issuer_id == Issuer.id
-            ).scalar_subquery()
-        ).all()
+        result = await db.execute(
+            text(f"""
+                SELECT DISTINCT ON (s.issuer_id) {_SCORE_COLUMNS}
+                FROM score s
+                JOIN issuer i ON i.id = s.issuer_id
+                WHERE i.sector = :sector
+                ORDER BY s.issuer_id, s.ts DESC
+            """),
+            {"sector": sector}
+        )
+        latest_scores = result.all()
         
-        return {
-            "sector": sector,
-            "scores": [score.to_dict() for score in latest_scores],
-            "total": len(latest_scores)
-        }
+        return Response(
+            content=encoder.encode({
+                "sector": sector,
+                "scores": [ScoreOut.from_orm(score) for score in latest_scores],
+                "total": len(latest_scores)
+            }),
+            media_type="application/json"
+        )
     except Exception as e:
         logger.error("Failed to get sector scores", error=str(e), sector=sector)
         raise HTTPException(status_code=500, detail="Internal server error")
-
-
-
-
-
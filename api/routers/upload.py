@@ -1,14 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File
+from fastapi.responses import Response
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from datetime import datetime
-import json
+import asyncio
+import codecs
+import hashlib
+import httpx
+import orjson
+import random
 import re
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import ahocorasick
+from cachetools import TTLCache
 import openai
-from services.db import get_db
+import structlog
+from services.db import get_db, AsyncSessionLocal
+from services.response_cache import get_redis, invalidate, NS_EVENTS, NS_SCORES
+
+logger = structlog.get_logger()
 
 router = APIRouter(prefix="/upload", tags=["upload"])
 
@@ -16,89 +28,272 @@ router = APIRouter(prefix="/upload", tags=["upload"])
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "your-openai-key-here")
 openai.api_key = OPENAI_API_KEY
 
+# Model and completion budget for news analysis; the JSON answer is well under 150 tokens
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+OPENAI_MAX_TOKENS = 220
+
+# Static rubric, sent as the system message so the user message is just the news text
+SYSTEM_PROMPT = """You are a credit risk analyst. Assess the credit score impact of the news text you are given.
+
+Respond with only a JSON object:
+{"sentiment": float -1.0..1.0, "impact_weight": float -10.0..10.0, "event_type": one of "earnings", "regulatory", "partnership", "product", "security", "leadership", "financial", "market", "confidence": float 0.0..1.0, "reasoning": brief string, "keywords": [string], "risk_factors": [string]}
+
+Negative news (stock drops, losses, scandals, regulatory issues) gets negative sentiment and impact_weight, scaled by severity. Positive news (earnings beats, revenue growth, partnerships, launches) gets positive values. Weigh financial performance, compliance, strategic deals, products, security incidents, leadership changes, market position and market reaction."""
+
+# Texts shorter than this, or without letters, are not worth a model call
+MIN_ANALYSIS_CHARS = 20
+# Characters of news text sent to the model, bounding prompt tokens and latency
+OPENAI_MAX_INPUT_CHARS = 4000
+
+_NEUTRAL_ANALYSIS = {
+    "sentiment": 0.0,
+    "weight": 0.0,
+    "type": "general",
+    "confidence": 0.0,
+    "reasoning": "Insufficient text for analysis",
+    "keywords": [],
+    "risk_factors": []
+}
+
+# Multi-article files: articles are separated by a line holding only "---" and
+# sent NEWS_BATCH_SIZE to a request. Blank lines are paragraph breaks, not separators.
+NEWS_BATCH_SIZE = 10
+_ARTICLE_SEPARATOR = re.compile(r"^[ \t]*---+[ \t]*$", re.MULTILINE)
+BATCH_INSTRUCTIONS = (
+    "The user message contains several numbered news items. Analyze each one separately and "
+    'respond with {"items": [...]}, holding one object per item in the same order.'
+)
+
+# Requests in flight to OpenAI at once, across all uploads in this process
+OPENAI_MAX_CONCURRENCY = 20
+
+# Shared async client; its connection pool is reused across requests, and the
+# SDK retries rate limits and timeouts with exponential backoff. Keep-alive
+# connections cover the full concurrency and idle for up to five minutes; the
+# transport itself retries failed connects. (httpx ignores client-level limits
+# when a transport is given, so they are set on the transport.)
+_openai_client = openai.AsyncOpenAI(
+    api_key=OPENAI_API_KEY,
+    max_retries=3,
+    http_client=httpx.AsyncClient(
+        transport=httpx.AsyncHTTPTransport(
+            retries=2,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=50,
+                keepalive_expiry=300.0,
+            ),
+        ),
+    ),
+)
+_openai_semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+
+# Upper bound on startup time spent opening the first OpenAI connection
+OPENAI_WARMUP_TIMEOUT = 5.0
+
+
+async def warm_openai_client():
+    """Open a pooled connection to OpenAI so the first analysis skips DNS and TLS setup"""
+    if OPENAI_API_KEY == "your-openai-key-here":
+        return
+    try:
+        await asyncio.wait_for(_openai_client.models.list(), OPENAI_WARMUP_TIMEOUT)
+    except Exception as e:
+        logger.warning("OpenAI connection warm-up failed", error=str(e))
+
+
+async def close_openai_client():
+    """Close the shared OpenAI client and its connection pool"""
+    await _openai_client.close()
+
+# News files larger than this are rejected; they are read in UPLOAD_CHUNK_SIZE pieces
+MAX_UPLOAD_BYTES = 1 << 20
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Analyses of identical news text are reused for a day
+ANALYSIS_CACHE_TTL = 86400
+
+
+async def _get_cached_analysis(key: str):
+    redis = get_redis()
+    if redis is None:
+        return None
+    try:
+        cached = await redis.get(key)
+    except Exception as e:
+        logger.warning("Analysis cache read failed", error=str(e))
+        return None
+    return orjson.loads(cached) if cached is not None else None
+
+
+async def _cache_analysis(key: str, analysis: Dict[str, Any]):
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.setex(key, ANALYSIS_CACHE_TTL, orjson.dumps(analysis))
+    except Exception as e:
+        logger.warning("Analysis cache write failed", error=str(e))
+
+
+async def read_upload_text(file: UploadFile) -> str:
+    """Decode an uploaded UTF-8 file chunk by chunk, rejecting oversized uploads"""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    parts = []
+    size = 0
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail="File is too large")
+        parts.append(decoder.decode(chunk))
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts).strip()
+
 class NewsTextRequest(BaseModel):
     news_text: str
     issuer_id: int = None
 
+def _too_short(news_text: str) -> bool:
+    return len(news_text) < MIN_ANALYSIS_CHARS or not any(c.isalpha() for c in news_text)
+
+def _news_cache_key(news_text: str) -> str:
+    return f"news:{hashlib.sha256(news_text.encode()).hexdigest()}"
+
+def _to_analysis(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a model answer onto the analysis fields used for score updates"""
+    return {
+        "sentiment": analysis.get("sentiment", 0.0),
+        "weight": analysis.get("impact_weight", 0.0),
+        "type": analysis.get("event_type", "general"),
+        "confidence": analysis.get("confidence", 0.5),
+        "reasoning": analysis.get("reasoning", ""),
+        "keywords": analysis.get("keywords", []),
+        "risk_factors": analysis.get("risk_factors", [])
+    }
+
 async def analyze_news_with_openai(news_text: str) -> Dict[str, Any]:
     """
     Use OpenAI to analyze news text and determine credit score impact
     """
+    if _too_short(news_text):
+        return dict(_NEUTRAL_ANALYSIS)
+    
+    cache_key = _news_cache_key(news_text)
+    cached = await _get_cached_analysis(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
-        # Create a structured prompt for credit analysis
-        prompt = f"""
-        Analyze the following news text and determine its impact on a company's credit score.
-        
-        News Text: "{news_text}"
-        
-        Please provide a JSON response with the following structure:
-        {{
-            "sentiment": float,  // -1.0 to 1.0 (negative to positive)
-            "impact_weight": float,  // -10.0 to 10.0 (credit score change)
-            "event_type": string,  // "earnings", "regulatory", "partnership", "product", "security", "leadership", "financial", "market"
-            "confidence": float,  // 0.0 to 1.0
-            "reasoning": string,  // Brief explanation of the analysis
-            "keywords": [string],  // Key terms that influenced the analysis
-            "risk_factors": [string]  // Any risk factors identified
-        }}
-        
-        IMPORTANT GUIDELINES:
-        - For negative news (stock drops, losses, scandals, etc.), use NEGATIVE sentiment (-1.0 to 0.0) and NEGATIVE impact_weight (-10.0 to 0.0)
-        - For positive news (earnings beats, growth, partnerships, etc.), use POSITIVE sentiment (0.0 to 1.0) and POSITIVE impact_weight (0.0 to 10.0)
-        - Stock price movements (tumbles, drops, crashes) should generally have negative impact
-        - Financial losses, regulatory issues, and scandals should have significant negative impact
-        - Earnings beats, revenue growth, and positive partnerships should have positive impact
+        async with _openai_semaphore:
+            response = await _openai_client.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": news_text[:OPENAI_MAX_INPUT_CHARS]}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.3,
+                max_tokens=OPENAI_MAX_TOKENS
+            )
         
-        Consider:
-        - Financial performance indicators (earnings, revenue, profit)
-        - Regulatory issues or compliance
-        - Strategic partnerships or acquisitions
-        - Product launches or innovations
-        - Security breaches or scandals
-        - Leadership changes
-        - Market position changes
-        - Industry-specific factors
-        - Stock price movements and market reactions
+        # JSON mode guarantees a parseable object
+        analysis = orjson.loads(response.choices[0].message.content)
         
-        Respond with ONLY the JSON object, no additional text.
-        """
-        
-        client = openai.OpenAI(api_key=OPENAI_API_KEY)
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a credit risk analyst. Analyze news text and provide structured credit impact assessment."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=500
-        )
-        
-        # Extract JSON from response
-        content = response.choices[0].message.content.strip()
-        
-        # Clean up the response to extract JSON
-        if content.startswith("```json"):
-            content = content[7:]
-        if content.endswith("```"):
-            content = content[:-3]
-        
-        analysis = json.loads(content)
-        
-        return {
-            "sentiment": analysis.get("sentiment", 0.0),
-            "weight": analysis.get("impact_weight", 0.0),
-            "type": analysis.get("event_type", "general"),
-            "confidence": analysis.get("confidence", 0.5),
-            "reasoning": analysis.get("reasoning", ""),
-            "keywords": analysis.get("keywords", []),
-            "risk_factors": analysis.get("risk_factors", [])
-        }
+        result = _to_analysis(analysis)
         
     except Exception as e:
-        # Fallback to keyword analysis if OpenAI fails
-        print(f"OpenAI analysis failed: {e}, using fallback")
-        return fallback_keyword_analysis(news_text)
+        # Fallback to keyword analysis if OpenAI fails, off the event loop since
+        # every request takes this path during an outage; not cached in Redis,
+        # so the text is sent to OpenAI again once it is reachable
+        logger.warning("OpenAI analysis failed, using keyword fallback", error=str(e))
+        return await asyncio.to_thread(fallback_keyword_analysis, news_text)
+    
+    await _cache_analysis(cache_key, result)
+    return result
+
+async def _analyze_news_chunk(texts: List[str]) -> List[Dict[str, Any]]:
+    # One request for the whole chunk; the model answers with one object per numbered item
+    numbered = "\n\n".join(
+        f"{i}. {text[:OPENAI_MAX_INPUT_CHARS]}" for i, text in enumerate(texts, 1)
+    )
+    try:
+        async with _openai_semaphore:
+            response = await _openai_client.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "system", "content": BATCH_INSTRUCTIONS},
+                    {"role": "user", "content": numbered}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.3,
+                max_tokens=OPENAI_MAX_TOKENS * len(texts)
+            )
+        items = orjson.loads(response.choices[0].message.content)["items"]
+        if len(items) != len(texts):
+            raise ValueError(f"expected {len(texts)} analyses, got {len(items)}")
+    except Exception as e:
+        logger.warning("OpenAI batch analysis failed, using keyword fallback", items=len(texts), error=str(e))
+        return await asyncio.to_thread(_fallback_keyword_analyses, texts)
+
+    results = [_to_analysis(item) for item in items]
+    await asyncio.gather(*(
+        _cache_analysis(_news_cache_key(text), result) for text, result in zip(texts, results)
+    ))
+    return results
+
+async def analyze_news_batch(texts: List[str]) -> List[Dict[str, Any]]:
+    """
+    Analyze several news items, packing up to NEWS_BATCH_SIZE uncached items per OpenAI request
+    """
+    results = [dict(_NEUTRAL_ANALYSIS) if _too_short(text) else None for text in texts]
+    lookups = [i for i, result in enumerate(results) if result is None]
+    cached = await asyncio.gather(*(_get_cached_analysis(_news_cache_key(texts[i])) for i in lookups))
+    pending = []
+    for i, result in zip(lookups, cached):
+        if result is None:
+            pending.append(i)
+        else:
+            results[i] = result
+
+    chunks = [pending[i:i + NEWS_BATCH_SIZE] for i in range(0, len(pending), NEWS_BATCH_SIZE)]
+    analyzed = await asyncio.gather(*(_analyze_news_chunk([texts[i] for i in chunk]) for chunk in chunks))
+    for chunk, chunk_results in zip(chunks, analyzed):
+        for i, result in zip(chunk, chunk_results):
+            results[i] = result
+    return results
+
+def split_news_items(news_text: str) -> List[str]:
+    """Split a news file into articles separated by "---" lines"""
+    return [item.strip() for item in _ARTICLE_SEPARATOR.split(news_text) if item.strip()]
+
+# Keyword weights for the fallback analysis
+POSITIVE_KEYWORDS = {
+    'earnings beat': 5.5, 'revenue growth': 4.8, 'profit increase': 4.2,
+    'market share': 3.5, 'partnership': 3.2, 'product launch': 3.8,
+    'expansion': 2.8, 'innovation': 2.5, 'strong': 2.0, 'record': 3.0,
+    'successful': 2.2, 'growth': 2.5, 'positive': 1.8, 'upgrade': 2.8
+}
+
+NEGATIVE_KEYWORDS = {
+    'earnings miss': -5.0, 'revenue decline': -4.5, 'loss': -4.0,
+    'investigation': -4.2, 'breach': -5.5, 'scandal': -5.8,
+    'resignation': -4.5, 'layoffs': -3.8, 'bankruptcy': -8.0,
+    'regulatory': -3.2, 'fine': -3.5, 'penalty': -3.0, 'weak': -2.5,
+    'tumbles': -4.0, 'tumble': -4.0, 'stock drop': -3.5, 'stock decline': -3.5,
+    'stock fall': -3.5, 'stock crash': -5.0, 'market crash': -5.0,
+    'plunge': -4.5, 'plunges': -4.5, 'drops': -3.0, 'drop': -3.0,
+    'declines': -3.0, 'decline': -3.0, 'falls': -3.0, 'fall': -3.0,
+    'sinks': -3.5, 'sink': -3.5, 'slumps': -3.0, 'slump': -3.0,
+    'downturn': -3.5, 'bearish': -2.5, 'negative': -2.0, 'down': -2.0
+}
+
+# All keywords in one automaton, matched in a single pass over the text.
+# Values carry the keyword's position so hits can be reported in table order.
+_KEYWORD_AUTOMATON = ahocorasick.Automaton()
+for _order, (_keyword, _weight) in enumerate({**POSITIVE_KEYWORDS, **NEGATIVE_KEYWORDS}.items()):
+    _KEYWORD_AUTOMATON.add_word(_keyword, (_order, _keyword, _weight))
+_KEYWORD_AUTOMATON.make_automaton()
 
 def fallback_keyword_analysis(text: str) -> Dict[str, Any]:
     """
@@ -106,31 +301,14 @@ def fallback_keyword_analysis(text: str) -> Dict[str, Any]:
     """
     text_lower = text.lower()
     
-    # Positive keywords
-    positive_keywords = {
-        'earnings beat': 5.5, 'revenue growth': 4.8, 'profit increase': 4.2,
-        'market share': 3.5, 'partnership': 3.2, 'product launch': 3.8,
-        'expansion': 2.8, 'innovation': 2.5, 'strong': 2.0, 'record': 3.0,
-        'successful': 2.2, 'growth': 2.5, 'positive': 1.8, 'upgrade': 2.8
-    }
-    
-    # Negative keywords
-    negative_keywords = {
-        'earnings miss': -5.0, 'revenue decline': -4.5, 'loss': -4.0,
-        'investigation': -4.2, 'breach': -5.5, 'scandal': -5.8,
-        'resignation': -4.5, 'layoffs': -3.8, 'bankruptcy': -8.0,
-        'regulatory': -3.2, 'fine': -3.5, 'penalty': -3.0, 'weak': -2.5,
-        'tumbles': -4.0, 'tumble': -4.0, 'stock drop': -3.5, 'stock decline': -3.5,
-        'stock fall': -3.5, 'stock crash': -5.0, 'market crash': -5.0,
-        'plunge': -4.5, 'plunges': -4.5, 'drops': -3.0, 'drop': -3.0,
-        'declines': -3.0, 'decline': -3.0, 'falls': -3.0, 'fall': -3.0,
-        'sinks': -3.5, 'sink': -3.5, 'slumps': -3.0, 'slump': -3.0,
-        'downturn': -3.5, 'bearish': -2.5, 'negative': -2.0, 'down': -2.0
-    }
-    
-    positive_score = sum(weight for keyword, weight in positive_keywords.items() if keyword in text_lower)
-    negative_score = sum(weight for keyword, weight in negative_keywords.items() if keyword in text_lower)
-    total_score = positive_score + negative_score
+    # Each keyword counts once, however often (or overlapped) it occurs;
+    # weights and names are collected in the same pass over the hits.
+    # Not memoized: the scan is linear, and keys would pin whole article texts.
+    total_score = 0.0
+    keywords = []
+    for _, keyword, weight in sorted({match for _, match in _KEYWORD_AUTOMATON.iter(text_lower)}):
+        total_score += weight
+        keywords.append(keyword)
     
     return {
         "sentiment": max(-1.0, min(1.0, total_score / 10.0)),
@@ -138,107 +316,143 @@ def fallback_keyword_analysis(text: str) -> Dict[str, Any]:
         "type": "general",
         "confidence": 0.6,
         "reasoning": "Keyword-based analysis (OpenAI fallback)",
-        "keywords": [k for k, v in positive_keywords.items() if k in text_lower] + 
-                   [k for k, v in negative_keywords.items() if k in text_lower],
+        "keywords": keywords,
         "risk_factors": []
     }
 
-async def update_issuer_score(conn: AsyncSession, issuer_id: int, news_text: str, analysis: Dict[str, Any]):
+def _fallback_keyword_analyses(texts: List[str]) -> List[Dict[str, Any]]:
+    return [fallback_keyword_analysis(text) for text in texts]
+
+# Inserts the news event and the adjusted score in one round trip. Nothing is
+# written when the issuer has no score yet (latest is empty). LOCALTIMESTAMP is
+# the transaction start time, so the event and score share one timestamp; :seq
+# adds microseconds so several updates in one transaction keep a strict order.
+# The article body is stored once, on the event; the score explanation references it.
+_UPDATE_SCORE_SQL = text("""
+    WITH latest AS (
+        SELECT score, base, market, event_delta, macro_adj
+        FROM score
+        WHERE issuer_id = :issuer_id
+        ORDER BY ts DESC
+        LIMIT 1
+    ),
+    inserted_event AS (
+        INSERT INTO event (issuer_id, ts, headline, body, type, sentiment, weight, source)
+        SELECT CAST(:issuer_id AS INT), LOCALTIMESTAMP + CAST(:seq AS INT) * INTERVAL '1 microsecond', left(CAST(:body AS TEXT), 200),
+               CAST(:body AS TEXT), CAST(:type AS TEXT), CAST(:sentiment AS DOUBLE PRECISION),
+               CAST(:weight AS DOUBLE PRECISION), 'openai_upload'
+        FROM latest
+        RETURNING id
+    ),
+    computed AS (
+        SELECT
+            score AS old_score,
+            base,
+            market,
+            macro_adj,
+            event_delta + CAST(:weight AS DOUBLE PRECISION) AS new_event_delta,
+            -- Keep the score within bounds
+            GREATEST(0, LEAST(100,
+                base + market + event_delta + CAST(:weight AS DOUBLE PRECISION) + macro_adj
+            )) AS new_score
+        FROM latest
+    ),
+    inserted_score AS (
+        INSERT INTO score (issuer_id, ts, score, bucket, base, market, event_delta, macro_adj, model_version, explanation)
+        SELECT
+            CAST(:issuer_id AS INT),
+            LOCALTIMESTAMP + CAST(:seq AS INT) * INTERVAL '1 microsecond',
+            ROUND(new_score::numeric, 1)::double precision,
+            CASE
+                WHEN new_score >= 90 THEN 'AAA'
+                WHEN new_score >= 80 THEN 'AA'
+                WHEN new_score >= 70 THEN 'A'
+                WHEN new_score >= 60 THEN 'BBB'
+                WHEN new_score >= 50 THEN 'BB'
+                ELSE 'B'
+            END,
+            base,
+            market,
+            ROUND(new_event_delta::numeric, 1)::double precision,
+            macro_adj,
+            'v4.0-openai-analysis',
+            CAST(:explanation AS JSONB) || jsonb_build_object('event_id', e.id)
+        FROM computed, inserted_event e
+        RETURNING score, bucket, event_delta
+    )
+    SELECT c.old_score, s.score AS new_score, s.bucket, s.event_delta AS new_event_delta
+    FROM computed c, inserted_score s
+""")
+
+async def update_issuer_score(conn: AsyncSession, issuer_id: int, news_text: str, analysis: Dict[str, Any], seq: int = 0):
     """
-    Update issuer score based on news analysis
+    Update issuer score based on news analysis.
+    
+    Does not commit; callers apply their updates and then call commit_score_updates
+    once. `seq` orders several updates made in the same transaction.
     """
-    # Insert the news event
-    await conn.execute(text("""
-        INSERT INTO event (issuer_id, ts, headline, type, sentiment, weight, source)
-        VALUES (:issuer_id, :ts, :headline, :type, :sentiment, :weight, :source)
-    """), {
+    result = await conn.execute(_UPDATE_SCORE_SQL, {
         "issuer_id": issuer_id,
-        "ts": datetime.now(),
-        "headline": news_text[:200],  # Truncate if too long
+        "seq": seq,
+        "body": news_text,
         "type": analysis["type"],
         "sentiment": analysis["sentiment"],
         "weight": analysis["weight"],
-        "source": "openai_upload"
-    })
-    
-    # Get current score
-    result = await conn.execute(text("""
-        SELECT score, base, market, event_delta, macro_adj 
-        FROM score 
-        WHERE issuer_id = :issuer_id 
-        ORDER BY ts DESC 
-        LIMIT 1
-    """), {"issuer_id": issuer_id})
-    current = result.fetchone()
-    
-    if not current:
-        raise HTTPException(status_code=404, detail=f"No current score found for issuer {issuer_id}")
-    
-    old_score, base, market, event_delta, macro_adj = current
-    
-    # Calculate new score - properly apply the weight
-    new_event_delta = event_delta + analysis["weight"]
-    new_score = base + market + new_event_delta + macro_adj
-    
-    # Ensure score stays within bounds
-    new_score = max(0, min(100, new_score))
-    
-    # Debug logging
-    print(f"🔍 Score calculation for issuer {issuer_id}:")
-    print(f"   Old score: {old_score}")
-    print(f"   Analysis weight: {analysis['weight']}")
-    print(f"   New event delta: {new_event_delta}")
-    print(f"   New score: {new_score}")
-    print(f"   Sentiment: {analysis['sentiment']}")
-    
-    # Determine new bucket
-    if new_score >= 90:
-        bucket = "AAA"
-    elif new_score >= 80:
-        bucket = "AA"
-    elif new_score >= 70:
-        bucket = "A"
-    elif new_score >= 60:
-        bucket = "BBB"
-    elif new_score >= 50:
-        bucket = "BB"
-    else:
-        bucket = "B"
-    
-    # Insert new score
-    await conn.execute(text("""
-        INSERT INTO score (issuer_id, ts, score, bucket, base, market, event_delta, macro_adj, model_version, explanation)
-        VALUES (:issuer_id, :ts, :score, :bucket, :base, :market, :event_delta, :macro_adj, :model_version, :explanation)
-    """), {
-        "issuer_id": issuer_id,
-        "ts": datetime.now(),
-        "score": round(new_score, 1),
-        "bucket": bucket,
-        "base": base,
-        "market": market,
-        "event_delta": round(new_event_delta, 1),
-        "macro_adj": macro_adj,
-        "model_version": "v4.0-openai-analysis",
-        "explanation": json.dumps({
+        "explanation": orjson.dumps({
             "source": "openai_upload",
-            "news_text": news_text,
             "analysis": analysis,
             "score_change": round(analysis["weight"], 1),
             "reason": f"OpenAI Analysis: {analysis['reasoning']}"
-        })
+        }).decode()
     })
+    updated = result.fetchone()
     
-    await conn.commit()
+    if not updated:
+        raise HTTPException(status_code=404, detail=f"No current score found for issuer {issuer_id}")
+    
+    logger.debug(
+        "Issuer score updated from news",
+        issuer_id=issuer_id,
+        old_score=updated.old_score,
+        new_score=updated.new_score,
+        new_event_delta=updated.new_event_delta,
+        weight=analysis["weight"],
+        sentiment=analysis["sentiment"],
+    )
     
     return {
         "issuer_id": issuer_id,
-        "old_score": round(old_score, 1),
-        "new_score": round(new_score, 1),
+        "old_score": round(updated.old_score, 1),
+        "new_score": updated.new_score,
         "change": round(analysis["weight"], 1),
-        "bucket": bucket,
+        "bucket": updated.bucket,
         "analysis": analysis
     }
 
+async def commit_score_updates(conn: AsyncSession):
+    """Commit the transaction's score updates and mark cached score/event responses stale"""
+    await conn.commit()
+    await invalidate(NS_SCORES, NS_EVENTS)
+
+# Issuer ids for random demo picks, reloaded at most once a minute
+_issuer_ids = TTLCache(maxsize=1, ttl=60)
+_SELECT_ISSUER_IDS = text("SELECT id FROM issuer")
+
+async def pick_random_issuer() -> int:
+    """Pick a demo issuer on a short-lived session so no connection is held during analysis"""
+    ids = _issuer_ids.get("ids")
+    if ids is None:
+        async with AsyncSessionLocal() as db:
+            ids = (await db.scalars(_SELECT_ISSUER_IDS)).all()
+        _issuer_ids["ids"] = ids
+    return random.choice(ids)
+
+async def resolve_issuer(issuer_id: Optional[int]) -> int:
+    """The requested issuer, or a random one for demo purposes when none is given"""
+    if issuer_id is None:
+        return await pick_random_issuer()
+    return issuer_id
+
 @router.post("/news-file")
 async def upload_news_file(
     file: UploadFile = File(...),
@@ -246,38 +460,67 @@ async def upload_news_file(
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Upload a news text file and analyze it with OpenAI to update credit scores
+    Upload a news text file and analyze it with OpenAI to update credit scores.
+    
+    A file holding several articles separated by "---" lines returns one
+    analysis and score update per article under "items".
     """
     try:
         # Validate file
         if not file.filename.endswith('.txt'):
             raise HTTPException(status_code=400, detail="Only .txt files are supported")
         
-        # Read file content
-        content = await file.read()
-        news_text = content.decode('utf-8').strip()
+        # Read file content in chunks, decoding as we go
+        if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail="File is too large")
+        news_text = await read_upload_text(file)
         
         if not news_text:
             raise HTTPException(status_code=400, detail="File is empty")
         
-        # If no issuer_id provided, use a random one (for demo purposes)
-        if issuer_id is None:
-            result = await db.execute(text("SELECT id FROM issuer ORDER BY RANDOM() LIMIT 1"))
-            issuer_id = result.scalar_one()
+        items = split_news_items(news_text)
+        if len(items) > 1:
+            # Multi-article file: analyze in batches, then apply the updates in order
+            logger.debug("Analyzing news file", file_name=file.filename, items=len(items))
+            issuer_id, analyses = await asyncio.gather(
+                resolve_issuer(issuer_id), analyze_news_batch(items)
+            )
+            # All items apply in one transaction: a failure leaves none of them written
+            updates = [
+                await update_issuer_score(db, issuer_id, item, analysis, seq)
+                for seq, (item, analysis) in enumerate(zip(items, analyses))
+            ]
+            await commit_score_updates(db)
+            return {
+                "message": f"{len(items)} news items analyzed and credit score updated successfully",
+                "file_name": file.filename,
+                "issuer_id": issuer_id,
+                "items": [
+                    {"analysis": analysis, "score_update": update}
+                    for analysis, update in zip(analyses, updates)
+                ],
+                "timestamp": datetime.now().isoformat()
+            }
         
-        # Analyze with OpenAI
-        print(f"🤖 Analyzing news with OpenAI for issuer {issuer_id}")
-        analysis = await analyze_news_with_openai(news_text)
+        # Analyze with OpenAI while the issuer is resolved
+        logger.debug("Analyzing news file", file_name=file.filename)
+        issuer_id, analysis = await asyncio.gather(
+            resolve_issuer(issuer_id), analyze_news_with_openai(news_text)
+        )
         
-        print(f"📊 OpenAI Analysis Results:")
-        print(f"   Sentiment: {analysis['sentiment']:.2f}")
-        print(f"   Impact Weight: {analysis['weight']:.1f}")
-        print(f"   Event Type: {analysis['type']}")
-        print(f"   Confidence: {analysis['confidence']:.2f}")
-        print(f"   Reasoning: {analysis['reasoning']}")
+        logger.debug(
+            "News analysis complete",
+            issuer_id=issuer_id,
+            sentiment=analysis["sentiment"],
+            weight=analysis["weight"],
+            event_type=analysis["type"],
+            confidence=analysis["confidence"],
+            reasoning=analysis["reasoning"],
+        )
         
         # Update issuer score
         result = await update_issuer_score(db, issuer_id, news_text, analysis)
+        await commit_score_updates(db)
         
         return {
             "message": "News file analyzed and credit score updated successfully",
@@ -288,6 +531,8 @@ async def upload_news_file(
             "timestamp": datetime.now().isoformat()
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
@@ -303,19 +548,15 @@ async def analyze_news_text(
         if not request.news_text.strip():
             raise HTTPException(status_code=400, detail="News text cannot be empty")
         
-        # If no issuer_id provided, use a random one
-        if request.issuer_id is None:
-            result = await db.execute(text("SELECT id FROM issuer ORDER BY RANDOM() LIMIT 1"))
-            issuer_id = result.scalar_one()
-        else:
-            issuer_id = request.issuer_id
-        
-        # Analyze with OpenAI
-        print(f"🤖 Analyzing news text with OpenAI for issuer {issuer_id}")
-        analysis = await analyze_news_with_openai(request.news_text)
+        # Analyze with OpenAI while the issuer is resolved
+        logger.debug("Analyzing news text")
+        issuer_id, analysis = await asyncio.gather(
+            resolve_issuer(request.issuer_id), analyze_news_with_openai(request.news_text)
+        )
         
         # Update issuer score
         result = await update_issuer_score(db, issuer_id, request.news_text, analysis)
+        await commit_score_updates(db)
         
         return {
             "message": "News text analyzed and credit score updated successfully",
@@ -328,23 +569,35 @@ async def analyze_news_text(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing text: {str(e)}")
 
+# The status document only changes with the process configuration, so it is
+# serialized and tagged once
+_STATUS_BODY = orjson.dumps({
+    "status": "active",
+    "features": [
+        "OpenAI-powered news analysis",
+        "File upload support (.txt)",
+        "Real-time credit score updates",
+        "Fallback keyword analysis"
+    ],
+    "openai_available": OPENAI_API_KEY != "your-openai-key-here",
+    "endpoints": {
+        "upload_file": "POST /api/v1/upload/news-file",
+        "analyze_text": "POST /api/v1/upload/news-text",
+        "status": "GET /api/v1/upload/status"
+    }
+})
+_STATUS_ETAG = f'"{hashlib.md5(_STATUS_BODY).hexdigest()}"'
+_STATUS_HEADERS = {"ETag": _STATUS_ETAG, "Cache-Control": "public, max-age=60"}
+
 @router.get("/status")
-async def get_upload_status():
+async def get_upload_status(request: Request):
     """
     Get upload system status
     """
-    return {
-        "status": "active",
-        "features": [
-            "OpenAI-powered news analysis",
-            "File upload support (.txt)",
-            "Real-time credit score updates",
-            "Fallback keyword analysis"
-        ],
-        "openai_available": OPENAI_API_KEY != "your-openai-key-here",
-        "endpoints": {
-            "upload_file": "POST /api/v1/upload/news-file",
-            "analyze_text": "POST /api/v1/upload/news-text",
-            "status": "GET /api/v1/upload/status"
-        }
-    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or _STATUS_ETAG in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=304, headers=_STATUS_HEADERS)
+    return Response(content=_STATUS_BODY, media_type="application/json", headers=_STATUS_HEADERS)
@@ -31,7 +31,7 @@ class IssuerListResponse(BaseModel):
     issuers: List[IssuerResponse]
     total: int
     limit: int
-    offset: int
+    next_cursor: Optional[int] = None
 
 class IssuerCreate(BaseModel):
     name: str = Field(..., min_length=1, max_length=200)
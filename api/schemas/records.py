@@ -0,0 +1,131 @@
+import msgspec
+from typing import Optional
+from datetime import datetime
+
+# Shared encoder; msgspec specializes encoding per Struct type
+encoder = msgspec.json.Encoder()
+
+
+class AlertSubscriptionOut(msgspec.Struct):
+    id: int
+    issuer_id: int
+    issuer_name: str
+    email: Optional[str]
+    webhook_url: Optional[str]
+    threshold: Optional[float]
+    is_active: Optional[bool]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    @classmethod
+    def from_orm(cls, row):
+        """Build from an AlertSubscription with its issuer loaded"""
+        return cls(
+            row.id,
+            row.issuer_id,
+            row.issuer.name,
+            row.email,
+            row.webhook_url,
+            row.threshold,
+            row.is_active,
+            row.created_at,
+            row.updated_at,
+        )
+
+
+class AlertHistoryOut(msgspec.Struct):
+    id: int
+    subscription_id: int
+    issuer_id: int
+    issuer_name: str
+    alert_type: str
+    message: Optional[str]
+    score_change: Optional[float]
+    triggered_at: Optional[datetime]
+
+    @classmethod
+    def from_orm(cls, row):
+        """Build from an AlertHistory with its issuer loaded"""
+        return cls(
+            row.id,
+            row.subscription_id,
+            row.issuer_id,
+            row.issuer.name,
+            row.alert_type,
+            row.message,
+            row.score_change,
+            row.triggered_at,
+        )
+
+
+class EventOut(msgspec.Struct):
+    id: int
+    issuer_id: int
+    ts: datetime
+    type: str
+    sentiment: Optional[float]
+    weight: Optional[float]
+    headline: Optional[str]
+    url: Optional[str]
+    raw_hash: Optional[str]
+    decay_factor: Optional[float]
+    source: Optional[str]
+    created_at: Optional[datetime]
+
+    @classmethod
+    def from_orm(cls, row):
+        return cls(
+            row.id,
+            row.issuer_id,
+            row.ts,
+            row.type,
+            row.sentiment,
+            row.weight,
+            row.headline,
+            row.url,
+            row.raw_hash,
+            row.decay_factor,
+            row.source,
+            row.created_at,
+        )
+
+
+class ScoreOut(msgspec.Struct):
+    id: int
+    issuer_id: int
+    ts: datetime
+    score: float
+    bucket: str
+    base: Optional[float]
+    market: Optional[float]
+    event_delta: Optional[float]
+    macro_adj: Optional[float]
+    model_version: Optional[str]
+    explanation: Optional[str]
+
+    @classmethod
+    def from_orm(cls, row):
+        return cls(
+            row.id,
+            row.issuer_id,
+            row.ts,
+            row.score,
+            row.bucket,
+            row.base,
+            row.market,
+            row.event_delta,
+            row.macro_adj,
+            row.model_version,
+            row.explanation,
+        )
+
+
+class IssuerOut(msgspec.Struct):
+    id: int
+    name: str
+    ticker: Optional[str]
+
+    @classmethod
+    def from_orm(cls, row):
+        return cls(row.id, row.name, row.ticker)
+
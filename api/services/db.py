@@ -1,15 +1,32 @@
+from functools import lru_cache
+from fastapi import Request
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from .config import settings
 
-# Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=False,
-    pool_pre_ping=True,
-    pool_recycle=300,
-)
+# Create async engine (one pool per process)
+@lru_cache(maxsize=1)
+def get_engine():
+    return create_async_engine(
+        settings.DATABASE_URL,
+        echo=False,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_POOL_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        # No SELECT 1 per checkout; connections that died are invalidated on
+        # their first failed query, and recycling bounds their age
+        pool_pre_ping=False,
+        pool_recycle=300,
+        # Per-connection cache of server-side prepared statements, so each
+        # hot query template is parsed and planned once per connection
+        connect_args={"prepared_statement_cache_size": 500},
+    )
+
+engine = get_engine()
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -21,16 +38,20 @@ AsyncSessionLocal = async_sessionmaker(
 # Base class for models
 Base = declarative_base()
 
-# Dependency to get database session
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+# Dependency to get database session; the session only checks out a
+# pooled connection on its first query and is closed by the context manager
+async def get_db(request: Request):
+    async with request.app.state.sessionmaker() as session:
+        yield session
 
 # Initialize database
 async def init_db():
     async with engine.begin() as conn:
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
+
+
+# Cheap connectivity check through the pool
+async def ping_db():
+    async with AsyncSessionLocal() as session:
+        await session.execute(text("SELECT 1"))
@@ -0,0 +1,36 @@
+from typing import Optional
+from cachetools import TTLCache
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.issuer import Issuer
+from schemas.records import IssuerOut
+
+# Issuers change rarely; five minutes of staleness is acceptable for names/tickers
+_cache = TTLCache(maxsize=10_000, ttl=300)
+
+
+async def get_issuer(db: AsyncSession, issuer_id: int) -> Optional[IssuerOut]:
+    """Resolve an issuer's id, name and ticker, hitting the database only on a miss"""
+    issuer = _cache.get(issuer_id)
+    if issuer is not None:
+        return issuer
+
+    result = await db.execute(
+        select(Issuer.id, Issuer.name, Issuer.ticker).where(Issuer.id == issuer_id)
+    )
+    row = result.first()
+    if row is None:
+        return None
+
+    issuer = IssuerOut.from_orm(row)
+    _cache[issuer_id] = issuer
+    return issuer
+
+
+def invalidate_issuer(issuer_id: Optional[int] = None):
+    """Drop one cached issuer, or all of them when no id is given"""
+    if issuer_id is None:
+        _cache.clear()
+    else:
+        _cache.pop(issuer_id, None)
@@ -0,0 +1,69 @@
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler
+
+_STOP = object()
+
+
+class QueueLogSink:
+    """File-like sink that hands log lines to a background writer thread"""
+
+    def __init__(self, stream=None):
+        self._stream = stream or sys.stdout.buffer
+        self._queue = queue.SimpleQueue()
+        self._handler = QueueHandler(self._queue)
+        self._thread = None
+
+    def write(self, data):
+        # Write through until the listener runs so nothing is stranded in the queue
+        if self._thread is None:
+            self._stream.write(data)
+        else:
+            self._queue.put(data)
+
+    def flush(self):
+        if self._thread is None:
+            self._stream.flush()
+
+    def start(self):
+        """Start draining the queue and route stdlib logging through it"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._drain, name="log-writer", daemon=True)
+        self._thread.start()
+        logging.getLogger().addHandler(self._handler)
+
+    def stop(self):
+        """Flush pending lines and stop the writer thread"""
+        if self._thread is None:
+            return
+        logging.getLogger().removeHandler(self._handler)
+        thread, self._thread = self._thread, None
+        self._queue.put(_STOP)
+        thread.join()
+        # Anything enqueued after the stop marker
+        while not self._queue.empty():
+            self._write(self._queue.get())
+        self._stream.flush()
+
+    def _drain(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            self._write(item)
+            if self._queue.empty():
+                self._stream.flush()
+
+    def _write(self, item):
+        if item is _STOP:
+            return
+        if isinstance(item, logging.LogRecord):
+            # Records from stdlib loggers were already formatted by QueueHandler
+            item = (item.getMessage() + "\n").encode()
+        self._stream.write(item)
+
+
+log_sink = QueueLogSink()
@@ -0,0 +1,198 @@
+import asyncio
+import functools
+import time
+from typing import Optional, Tuple
+
+import orjson
+import structlog
+from fastapi.responses import Response
+from redis import asyncio as aioredis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.config import settings
+from services.db import AsyncSessionLocal
+
+logger = structlog.get_logger()
+
+# Bodies live under respcache:<namespace>:<endpoint>:<params>; a matching
+# respcache:fresh:... marker expires after the TTL, and the body is served
+# stale for STALE_GRACE more seconds while it is rebuilt in the background.
+# The marker holds the namespace's respcache:version:<namespace> counter as of
+# the build; bumping the counter makes every marker in the namespace stale at
+# once, without scanning for keys. workers/cache_invalidation.py relies on this layout.
+CACHE_PREFIX = "respcache"
+FRESH_PREFIX = f"{CACHE_PREFIX}:fresh"
+VERSION_PREFIX = f"{CACHE_PREFIX}:version"
+STALE_GRACE = 300
+REFRESH_LOCK_TTL = 30
+
+# Namespaces, grouped by the table whose writes make the responses stale
+NS_SCORES = "scores"
+NS_EVENTS = "events"
+NS_ISSUERS = "issuers"
+
+# (min, max) TTL in seconds for each cache policy
+TTL_SHORT = (10, 30)
+TTL_NORMAL = (30, 120)
+TTL_LONG = (300, 1800)
+
+# Seconds of TTL per millisecond spent building the response; slow aggregates live longer
+ADAPTIVE_TTL_FACTOR = 5
+
+_redis: Optional[aioredis.Redis] = None
+
+# Strong references to in-flight background refreshes
+_refresh_tasks = set()
+
+
+def init_cache():
+    """Create the Redis client used for cached responses"""
+    global _redis
+    _redis = aioredis.from_url(settings.REDIS_URL)
+
+
+def get_redis() -> Optional[aioredis.Redis]:
+    """Shared async Redis client, or None before startup"""
+    return _redis
+
+
+async def close_cache():
+    """Close the Redis client"""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+def adaptive_ttl(elapsed_ms: float, policy: Tuple[int, int]) -> int:
+    """Scale the TTL with generation time, clamped to the policy bounds"""
+    low, high = policy
+    return max(low, min(high, int(elapsed_ms * ADAPTIVE_TTL_FACTOR)))
+
+
+def _cache_key(namespace: str, endpoint: str, kwargs: dict) -> str:
+    # Only plain query/path parameters identify a response; sessions and requests do not
+    params = ",".join(
+        f"{name}={value}"
+        for name, value in sorted(kwargs.items())
+        if value is None or isinstance(value, (str, int, float, bool))
+    )
+    return f"{namespace}:{endpoint}:{params}"
+
+
+def _version_key(namespace: str) -> str:
+    return f"{VERSION_PREFIX}:{namespace}"
+
+
+async def _namespace_version(namespace: str) -> bytes:
+    return await _redis.get(_version_key(namespace)) or b"0"
+
+
+async def invalidate(*namespaces: str):
+    """
+    Mark every cached response in the given namespaces as stale.
+
+    Bodies are kept, so the next request is served from cache while it refreshes.
+    """
+    if _redis is None:
+        return
+    try:
+        async with _redis.pipeline(transaction=False) as pipe:
+            for namespace in namespaces:
+                pipe.incr(_version_key(namespace))
+            await pipe.execute()
+    except Exception as e:
+        logger.warning("Response cache invalidation failed", namespaces=namespaces, error=str(e))
+
+
+async def _render(func, args, kwargs) -> Tuple[Optional[bytes], float, object]:
+    start = time.perf_counter()
+    result = await func(*args, **kwargs)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if isinstance(result, Response):
+        if result.status_code != 200:
+            return None, elapsed_ms, result
+        return result.body, elapsed_ms, result
+    return orjson.dumps(result), elapsed_ms, result
+
+
+async def _store(key: str, body: bytes, elapsed_ms: float, policy: Tuple[int, int], version: bytes):
+    # `version` is the namespace version read before the body was built, so an
+    # invalidation that lands mid-build leaves the entry stale
+    ttl = adaptive_ttl(elapsed_ms, policy)
+    try:
+        async with _redis.pipeline(transaction=False) as pipe:
+            pipe.set(f"{CACHE_PREFIX}:{key}", body, ex=ttl + STALE_GRACE)
+            pipe.set(f"{FRESH_PREFIX}:{key}", version, ex=ttl)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning("Response cache write failed", key=key, error=str(e))
+
+
+async def _refresh(func, args, kwargs, key: str, policy: Tuple[int, int], namespace: str):
+    # The request's session is closed by the time this runs, so bring a new one
+    try:
+        version = await _namespace_version(namespace)
+        async with AsyncSessionLocal() as db:
+            kwargs = {
+                name: db if isinstance(value, AsyncSession) else value
+                for name, value in kwargs.items()
+            }
+            body, elapsed_ms, _ = await _render(func, args, kwargs)
+        if body is not None:
+            await _store(key, body, elapsed_ms, policy, version)
+    except Exception as e:
+        logger.warning("Response cache refresh failed", key=key, error=str(e))
+    finally:
+        try:
+            await _redis.delete(f"{CACHE_PREFIX}:lock:{key}")
+        except Exception:
+            pass
+
+
+def cached(policy: Tuple[int, int], namespace: str):
+    """
+    Cache a global (not per-user) JSON endpoint's serialized body in Redis.
+
+    Expired entries are served stale while a single background task rebuilds them.
+    Redis errors are logged and the endpoint is served uncached.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if _redis is None:
+                return await func(*args, **kwargs)
+
+            key = _cache_key(namespace, func.__name__, kwargs)
+            try:
+                body, fresh, version = await _redis.mget(
+                    f"{CACHE_PREFIX}:{key}", f"{FRESH_PREFIX}:{key}", _version_key(namespace)
+                )
+            except Exception as e:
+                logger.warning("Response cache read failed", key=key, error=str(e))
+                body = fresh = version = None
+            version = version or b"0"
+
+            if body is not None:
+                if fresh != version:
+                    try:
+                        locked = await _redis.set(
+                            f"{CACHE_PREFIX}:lock:{key}", 1, nx=True, ex=REFRESH_LOCK_TTL
+                        )
+                    except Exception:
+                        locked = False
+                    if locked:
+                        task = asyncio.create_task(_refresh(func, args, kwargs, key, policy, namespace))
+                        _refresh_tasks.add(task)
+                        task.add_done_callback(_refresh_tasks.discard)
+                return Response(content=body, media_type="application/json")
+
+            body, elapsed_ms, result = await _render(func, args, kwargs)
+            if body is None:
+                return result
+            await _store(key, body, elapsed_ms, policy, version)
+            return Response(content=body, media_type="application/json")
+
+        return wrapper
+    return decorator
@@ -0,0 +1,68 @@
+from typing import Any, Callable
+import structlog
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from services.db import AsyncSessionLocal
+from schemas.records import encoder
+
+logger = structlog.get_logger()
+
+# Rows fetched per server-side cursor round trip
+STREAM_BATCH_SIZE = 500
+
+
+async def _open_stream(key: str, statement, encode: Callable[[Any], bytes], fields: dict, scalars: bool) -> StreamingResponse:
+    # The query runs and its first batch is fetched before any header is sent,
+    # so database errors still reach the endpoint's error handling as a 500
+    db = AsyncSessionLocal()
+    try:
+        statement_ = statement.execution_options(yield_per=STREAM_BATCH_SIZE)
+        if scalars:
+            result = await db.stream_scalars(statement_)
+        else:
+            result = await db.stream(statement_)
+        first = await result.fetchmany(STREAM_BATCH_SIZE)
+    except Exception:
+        await db.close()
+        raise
+
+    async def chunks():
+        head = encoder.encode(fields)[:-1]
+        yield head + (b"," if fields else b"") + encoder.encode(key) + b":["
+
+        total = 0
+        try:
+            for row in first:
+                yield (b"," if total else b"") + encode(row)
+                total += 1
+            async for row in result:
+                yield (b"," if total else b"") + encode(row)
+                total += 1
+        except Exception as e:
+            # Headers are already sent; all we can do is log and abort the body
+            logger.error("Failed to stream list response", key=key, error=str(e))
+            raise
+        finally:
+            await db.close()
+
+        yield b'],"total":' + str(total).encode() + b"}"
+
+    # Also closes the session if the body is never iterated (client went away)
+    return StreamingResponse(chunks(), media_type="application/json", background=BackgroundTask(db.close))
+
+
+async def stream_json_list(key: str, statement, encode: Callable[[Any], bytes], **fields) -> StreamingResponse:
+    """
+    Stream `{**fields, key: [...], "total": n}` while iterating a server-side cursor.
+
+    Uses its own session, since the request-scoped one may be closed before the
+    body has been sent. Errors running the query are raised from this call;
+    errors after the first batch can only truncate the body.
+    """
+    return await _open_stream(key, statement, encode, fields, scalars=True)
+
+
+async def stream_json_rows(key: str, statement, encode: Callable[[Any], bytes], **fields) -> StreamingResponse:
+    """Like stream_json_list, for column selects: `encode` receives each Row"""
+    return await _open_stream(key, statement, encode, fields, scalars=False)
@@ -0,0 +1,10 @@
+from celery import Celery
+from .config import settings
+
+# Producer-only client; the task implementations live in the workers service
+celery_client = Celery("credtech_api", broker=settings.CELERY_BROKER_URL)
+
+
+def enqueue_alert(subscription_id: int, payload: dict):
+    """Hand an alert notification to the workers"""
+    celery_client.send_task("send_alert", args=[subscription_id, payload])
@@ -75,9 +75,11 @@ CREATE TABLE event (
   sentiment DOUBLE PRECISION,
   weight DOUBLE PRECISION,
   headline TEXT,
+  body TEXT,
   url TEXT,
   raw_hash TEXT,
   decay_factor DOUBLE PRECISION DEFAULT 1.0,
+  effective_weight DOUBLE PRECISION GENERATED ALWAYS AS (COALESCE(weight * decay_factor, 0)) STORED,
   source TEXT,
   created_at TIMESTAMP DEFAULT now(),
   PRIMARY KEY (id, ts)
@@ -161,7 +163,9 @@ CREATE INDEX idx_price_ts ON price(ts DESC);
 CREATE INDEX idx_feature_issuer_ts ON feature_snapshot(issuer_id, ts DESC);
 CREATE INDEX idx_feature_name ON feature_snapshot(feature_name);
 
-CREATE INDEX idx_score_issuer_ts ON score(issuer_id, ts DESC);
+-- Covers latest-score lookups (DISTINCT ON / LIMIT 1 per issuer) as index-only scans
+CREATE INDEX idx_score_issuer_ts_latest ON score(issuer_id, ts DESC)
+  INCLUDE (score, bucket, base, market, event_delta, macro_adj);
 CREATE INDEX idx_score_ts ON score(ts DESC);
 CREATE INDEX idx_score_bucket ON score(bucket);
 
@@ -169,11 +173,12 @@ CREATE INDEX idx_event_issuer_ts ON event(issuer_id, ts DESC);
 CREATE INDEX idx_event_type ON event(type);
 CREATE INDEX idx_event_ts ON event(ts DESC);
 CREATE INDEX idx_event_hash ON event(raw_hash);
+CREATE INDEX idx_event_ts_type ON event(ts, type) INCLUDE (effective_weight, sentiment);
 
 CREATE INDEX idx_macro_key_ts ON macro(key, ts DESC);
 
 CREATE INDEX idx_alert_subscription_issuer ON alert_subscription(issuer_id);
-CREATE INDEX idx_alert_history_issuer ON alert_history(issuer_id);
+CREATE INDEX idx_alert_history_issuer_triggered ON alert_history(issuer_id, triggered_at DESC);
 
 -- Create functions for automatic timestamp updates
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -313,6 +318,15 @@ LEFT JOIN LATERAL (
     LIMIT 1
 ) s ON true;
 
+-- Latest score per issuer for distribution queries; refreshed by the
+-- refresh_latest_score_view worker task (unique index allows CONCURRENTLY)
+CREATE MATERIALIZED VIEW mv_latest_score AS
+SELECT DISTINCT ON (issuer_id) issuer_id, bucket, score
+FROM score
+ORDER BY issuer_id, ts DESC;
+
+CREATE UNIQUE INDEX idx_mv_latest_score_issuer ON mv_latest_score(issuer_id);
+
 -- Create view for recent alerts
 CREATE VIEW recent_alerts AS
 SELECT 
@@ -0,0 +1,8 @@
+-- Serve per-issuer alert history (ORDER BY triggered_at DESC LIMIT n) from one index.
+-- The composite index also covers plain issuer_id lookups, so the old one is dropped.
+-- Run outside a transaction block (CONCURRENTLY).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_alert_history_issuer_triggered
+    ON alert_history(issuer_id, triggered_at DESC);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_alert_history_issuer;
@@ -0,0 +1,14 @@
+-- Latest-row lookups (WHERE issuer_id = ? ORDER BY ts DESC LIMIT n) and the
+-- /events/latest feed walk these indexes instead of sorting.
+-- No-ops on databases created from init_db.sql, which already has them.
+-- score and event are hypertables, which do not support CONCURRENTLY;
+-- transaction_per_chunk builds chunk by chunk to keep locks short.
+
+CREATE INDEX IF NOT EXISTS idx_score_issuer_ts
+    ON score(issuer_id, ts DESC) WITH (timescaledb.transaction_per_chunk);
+
+CREATE INDEX IF NOT EXISTS idx_event_issuer_ts
+    ON event(issuer_id, ts DESC) WITH (timescaledb.transaction_per_chunk);
+
+CREATE INDEX IF NOT EXISTS idx_event_ts
+    ON event(ts DESC) WITH (timescaledb.transaction_per_chunk);
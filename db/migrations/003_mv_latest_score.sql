@@ -0,0 +1,12 @@
+-- Latest score per issuer, read by /metrics and /scores/buckets instead of
+-- aggregating over the whole score table on every request.
+-- Refreshed every minute by the refresh_latest_score_view worker task; the
+-- unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY.
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_latest_score AS
+SELECT DISTINCT ON (issuer_id) issuer_id, bucket, score
+FROM score
+ORDER BY issuer_id, ts DESC;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_latest_score_issuer
+    ON mv_latest_score(issuer_id);
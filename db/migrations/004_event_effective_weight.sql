@@ -0,0 +1,12 @@
+-- Store the decayed event weight so /events/summary can SUM it in SQL, and
+-- cover the summary's ts range scan + GROUP BY type with an index-only scan.
+-- The column add rewrites the event table; run in a maintenance window.
+-- event is a hypertable (no CONCURRENTLY); the index is built per chunk.
+
+ALTER TABLE event
+    ADD COLUMN IF NOT EXISTS effective_weight DOUBLE PRECISION
+    GENERATED ALWAYS AS (COALESCE(weight * decay_factor, 0)) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_event_ts_type
+    ON event(ts, type) INCLUDE (effective_weight, sentiment)
+    WITH (timescaledb.transaction_per_chunk);
@@ -0,0 +1,5 @@
+-- Keep the full text of uploaded news on its event instead of copying it into
+-- the explanation of every score row it produces. Adding a nullable column
+-- without a default is a catalog-only change.
+
+ALTER TABLE event ADD COLUMN IF NOT EXISTS body TEXT;
@@ -0,0 +1,12 @@
+-- Latest-score lookups (DISTINCT ON (issuer_id) ... ORDER BY issuer_id, ts DESC,
+-- and per-issuer ORDER BY ts DESC LIMIT 1) read only these columns, so a
+-- covering index lets them run as index-only scans. It replaces
+-- idx_score_issuer_ts, which has the same key.
+-- score is a hypertable (no CONCURRENTLY); the index is built per chunk.
+
+CREATE INDEX IF NOT EXISTS idx_score_issuer_ts_latest
+    ON score(issuer_id, ts DESC)
+    INCLUDE (score, bucket, base, market, event_delta, macro_adj)
+    WITH (timescaledb.transaction_per_chunk);
+
+DROP INDEX IF EXISTS idx_score_issuer_ts;
@@ -8,11 +8,15 @@ import sys
 import os
 import argparse
 import hashlib
+import traceback
+import json
 from datetime import datetime
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
+from functools import lru_cache
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
+from psycopg2.extras import execute_values
 from dotenv import load_dotenv
 from workers.tasks_ingest_unstructured import classify_event, calculate_sentiment, calculate_event_weight
 from workers.tasks_score_compute import compute_issuer_score
@@ -21,12 +25,23 @@ from workers.tasks_score_compute import compute_issuer_score
 load_dotenv()
 
 # Database connection
+# Engine and session factory are built once per process, on first use
+@lru_cache(maxsize=1)
+def get_sessionmaker():
+    database_url = f"postgresql://{os.getenv('POSTGRES_USER', 'credtech')}:{os.getenv('POSTGRES_PASSWORD', 'credtech_pass')}@{os.getenv('POSTGRES_HOST', 'postgres')}:{os.getenv('POSTGRES_PORT', '5432')}/{os.getenv('POSTGRES_DB', 'credtech')}"
+    # Demo events are regeneratable, so commits need not wait for the WAL fsync
+    engine = create_engine(
+        database_url,
+        pool_size=5,
+        max_overflow=0,
+        pool_pre_ping=True,
+        connect_args={"options": "-c synchronous_commit=off"},
+    )
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
 def get_db_session():
     """Get database session"""
-    database_url = f"postgresql://{os.getenv('POSTGRES_USER', 'credtech')}:{os.getenv('POSTGRES_PASSWORD', 'credtech_pass')}@{os.getenv('POSTGRES_HOST', 'postgres')}:{os.getenv('POSTGRES_PORT', '5432')}/{os.getenv('POSTGRES_DB', 'credtech')}"
-    engine = create_engine(database_url)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    return SessionLocal()
+    return get_sessionmaker()()
 
 def get_issuer_by_ticker(db, ticker):
     """Get issuer by ticker symbol"""
@@ -57,7 +72,7 @@ def inject_event(db, issuer_id, headline, event_type, sentiment):
         weight = calculate_event_weight(event_type, sentiment)
         
         # Create hash for deduplication
-        content_hash = hashlib.sha256(f"{headline}{datetime.now().isoformat()}".encode()).hexdigest()
+        content_hash = hashlib.sha256(headline.encode()).hexdigest()
         
         # Insert event
         db.execute(
@@ -86,33 +101,107 @@ def inject_event(db, issuer_id, headline, event_type, sentiment):
         db.rollback()
         return False
 
+def inject_events(db, events):
+    """
+    Inject many events with one multi-row INSERT and one commit.
+    
+    `events` holds (issuer_id, headline, event_type, sentiment) tuples.
+    """
+    rows = []
+    for issuer_id, headline, event_type, sentiment in events:
+        rows.append((
+            issuer_id,
+            datetime.now(),
+            event_type,
+            sentiment,
+            calculate_event_weight(event_type, sentiment),
+            headline,
+            "https://demo.blackswan.com/news",
+            hashlib.sha256(headline.encode()).hexdigest(),
+            "demo_injection"
+        ))
+    
+    try:
+        cursor = db.connection().connection.cursor()
+        execute_values(cursor, """
+            INSERT INTO event (issuer_id, ts, type, sentiment, weight, headline, url, raw_hash, source)
+            VALUES %s
+        """, rows, page_size=1000)
+        db.commit()
+        return True
+        
+    except Exception as e:
+        print(f"Error injecting events: {e}")
+        db.rollback()
+        return False
+
+def inject_jsonl(db, path):
+    """
+    Inject every headline in a JSON Lines file, then rescore the affected issuers.
+    
+    Each line holds "issuer" (ticker), "headline", "type" and optionally "sentiment".
+    """
+    with open(path) as f:
+        items = [json.loads(line) for line in f if line.strip()]
+    
+    tickers = {item["issuer"].upper() for item in items}
+    issuer_ids = dict(db.execute(
+        text("SELECT ticker, id FROM issuer WHERE ticker = ANY(:tickers)"),
+        {"tickers": list(tickers)}
+    ).fetchall())
+    missing = tickers - issuer_ids.keys()
+    if missing:
+        print(f"❌ Issuers not found: {', '.join(sorted(missing))}")
+        sys.exit(1)
+    
+    events = [
+        (
+            issuer_ids[item["issuer"].upper()],
+            item["headline"],
+            item["type"],
+            item.get("sentiment") or calculate_sentiment(item["headline"]),
+        )
+        for item in items
+    ]
+    if not inject_events(db, events):
+        print("❌ Failed to inject events")
+        sys.exit(1)
+    print(f"✅ Injected {len(events)} events for {len(issuer_ids)} issuers")
+    
+    for ticker, issuer_id in sorted(issuer_ids.items()):
+        result = compute_new_score(issuer_id)
+        if result and result.get("status") == "success":
+            print(f"   {ticker}: {result['score']:.1f} ({result['bucket']})")
+        else:
+            print(f"   {ticker}: ❌ failed to compute new score")
+
 def compute_new_score(issuer_id):
     """Compute new score for the issuer"""
     try:
-        # Import the task function
-        from workers.tasks_score_compute import compute_issuer_score
-        
         # Run the task directly (not as Celery task for demo)
-        result = compute_issuer_score(issuer_id)
-        return result
+        return compute_issuer_score(issuer_id)
         
-    except Exception as e:
-        print(f"Error computing new score: {e}")
+    except Exception:
+        traceback.print_exc()
         return None
 
 def main():
     parser = argparse.ArgumentParser(description="Inject demo headline and show score change")
-    parser.add_argument("--issuer", required=True, help="Ticker symbol (e.g., AAPL)")
-    parser.add_argument("--headline", required=True, help="News headline")
-    parser.add_argument("--type", required=True, 
+    parser.add_argument("--issuer", help="Ticker symbol (e.g., AAPL)")
+    parser.add_argument("--headline", help="News headline")
+    parser.add_argument("--type", 
                        choices=["restructuring", "bankruptcy", "downgrade", "earnings_miss", 
                                "guidance_cut", "management_change", "acquisition", 
                                "positive_earnings_beat", "dividend_cut", "regulatory_investigation"],
                        help="Event type")
     parser.add_argument("--sentiment", type=float, default=0.0, 
                        help="Sentiment score (-1 to 1, default: auto-calculate)")
+    parser.add_argument("--jsonl", metavar="FILE",
+                       help="Inject every headline in a JSON Lines file in one batch")
     
     args = parser.parse_args()
+    if not args.jsonl and not (args.issuer and args.headline and args.type):
+        parser.error("--issuer, --headline and --type are required without --jsonl")
     
     print("=" * 60)
     print("BLACKSWAN CREDIT INTELLIGENCE - DEMO HEADLINE INJECTION")
@@ -121,6 +210,10 @@ def main():
     try:
         db = get_db_session()
         
+        if args.jsonl:
+            inject_jsonl(db, args.jsonl)
+            return
+        
         # Get issuer
         issuer = get_issuer_by_ticker(db, args.issuer)
         if not issuer:
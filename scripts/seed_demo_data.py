@@ -6,24 +6,34 @@ Populates the database with sample issuers and historical data.
 
 import sys
 import os
+import argparse
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
+from psycopg2.extras import Json, execute_values
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-import random
 import numpy as np
-import json
+import csv
+import io
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# One generator for the whole run; a fixed seed makes the demo data reproducible
+RNG = np.random.default_rng(int(os.getenv("BLACKSWAN_SEED", "42")))
+
+# Below this many issuers, starting worker processes costs more than generating in-line
+PARALLEL_MIN_ISSUERS = 32
+
 # Database connection
 def get_db_session():
     """Get database session"""
     database_url = f"postgresql://{os.getenv('POSTGRES_USER', 'credtech')}:{os.getenv('POSTGRES_PASSWORD', 'credtech_pass')}@{os.getenv('POSTGRES_HOST', 'postgres')}:{os.getenv('POSTGRES_PORT', '5432')}/{os.getenv('POSTGRES_DB', 'credtech')}"
-    engine = create_engine(database_url)
+    # Seed data is regeneratable, so the one commit need not wait for the WAL fsync
+    engine = create_engine(database_url, connect_args={"options": "-c synchronous_commit=off"})
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     return SessionLocal()
 
@@ -46,61 +56,160 @@ SAMPLE_ISSUERS = [
     {"name": "Walmart Inc", "ticker": "WMT", "cik": "0000104169", "sector": "Consumer Staples", "country": "US"}
 ]
 
+# Statements are built once; the bulk INSERTs take their rows through execute_values
+SELECT_EXISTING_TICKERS = text("SELECT ticker FROM issuer WHERE ticker = ANY(:tickers)")
+SELECT_ISSUER_SECTORS = text("SELECT id, ticker, sector FROM issuer")
+SELECT_ISSUER_NAMES = text("SELECT id, name, ticker FROM issuer")
+
+INSERT_ISSUERS = """
+    INSERT INTO issuer (name, ticker, cik, sector, country)
+    VALUES %s
+"""
+
+INSERT_FEATURES = """
+    INSERT INTO feature_snapshot (issuer_id, ts, feature_name, value, source)
+    VALUES %s
+    ON CONFLICT (id, ts) DO UPDATE SET
+    value = EXCLUDED.value, source = EXCLUDED.source
+"""
+
+INSERT_MACRO = """
+    INSERT INTO macro (ts, key, value, source)
+    VALUES %s
+    ON CONFLICT (id, ts) DO UPDATE SET
+    value = EXCLUDED.value, source = EXCLUDED.source
+"""
+
+INSERT_EVENTS = """
+    INSERT INTO event (issuer_id, ts, type, sentiment, weight, headline, url, raw_hash, source)
+    VALUES %s
+    ON CONFLICT (id, ts) DO NOTHING
+"""
+
+# Secondary indexes on the bulk-loaded tables, as defined in db/init_db.sql.
+# --fast drops them before the load and builds each once afterwards.
+BULK_LOAD_INDEXES = (
+    ("idx_price_issuer_ts", "CREATE INDEX idx_price_issuer_ts ON price(issuer_id, ts DESC)"),
+    ("idx_price_ts", "CREATE INDEX idx_price_ts ON price(ts DESC)"),
+    ("idx_feature_issuer_ts", "CREATE INDEX idx_feature_issuer_ts ON feature_snapshot(issuer_id, ts DESC)"),
+    ("idx_feature_name", "CREATE INDEX idx_feature_name ON feature_snapshot(feature_name)"),
+)
+
+INSERT_SCORES = """
+    INSERT INTO score (issuer_id, ts, score, bucket, base, market, event_delta, macro_adj, model_version, explanation)
+    VALUES %s
+"""
+
+def copy_rows(db, table, columns, rows):
+    """Stream rows into a table with a single COPY over the session's connection"""
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    buf.seek(0)
+
+    # COPY isn't available through text(); use the underlying psycopg2 connection
+    raw = db.connection().connection
+    with raw.cursor() as cur:
+        cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH CSV", buf)
+
+def daily_dates(start_date, end_date):
+    """Every day from start_date to end_date inclusive, as a datetime64[us] array"""
+    n_days = (end_date - start_date).days + 1
+    return np.datetime64(start_date, "us") + np.arange(n_days).astype("timedelta64[D]")
+
+def issuer_seeds(count):
+    """Independent child seeds, so per-issuer draws don't depend on where they run"""
+    return RNG.bit_generator.seed_seq.spawn(count)
+
+def map_issuers(func, tasks):
+    """Run per-issuer generation, fanning out to worker processes for large issuer sets"""
+    if len(tasks) < PARALLEL_MIN_ISSUERS:
+        return [func(task) for task in tasks]
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(func, tasks, chunksize=8))
+
+def seed_prepare(db):
+    """Drop the bulk-loaded tables' secondary indexes ahead of the load"""
+    # Hypertables can't be made UNLOGGED, so index maintenance is all there is to skip
+    print("Dropping bulk-load indexes...")
+    for name, _ in BULK_LOAD_INDEXES:
+        db.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+def seed_finalize(db):
+    """Rebuild the indexes dropped by seed_prepare and refresh planner statistics"""
+    print("Rebuilding bulk-load indexes...")
+    for _, create_sql in BULK_LOAD_INDEXES:
+        db.execute(text(create_sql))
+    db.execute(text("ANALYZE price"))
+    db.execute(text("ANALYZE feature_snapshot"))
+
 def seed_issuers(db):
     """Seed issuers table"""
     print("Seeding issuers...")
     
+    # Check which issuers already exist in one query
+    existing = {
+        row[0] for row in db.execute(
+            SELECT_EXISTING_TICKERS,
+            {"tickers": [issuer_data["ticker"] for issuer_data in SAMPLE_ISSUERS]}
+        )
+    }
+    
+    new_issuers = []
     for issuer_data in SAMPLE_ISSUERS:
-        # Check if issuer already exists
-        existing = db.execute(
-            text("SELECT id FROM issuer WHERE ticker = :ticker"),
-            {"ticker": issuer_data["ticker"]}
-        ).fetchone()
-        
-        if not existing:
-            db.execute(
-                text("""
-                    INSERT INTO issuer (name, ticker, cik, sector, country)
-                    VALUES (:name, :ticker, :cik, :sector, :country)
-                """),
-                issuer_data
-            )
-            print(f"  Added: {issuer_data['name']} ({issuer_data['ticker']})")
-        else:
+        if issuer_data["ticker"] in existing:
             print(f"  Exists: {issuer_data['name']} ({issuer_data['ticker']})")
+        else:
+            new_issuers.append(issuer_data)
+            print(f"  Added: {issuer_data['name']} ({issuer_data['ticker']})")
     
-    db.commit()
+    if new_issuers:
+        cursor = db.connection().connection.cursor()
+        execute_values(cursor, INSERT_ISSUERS, [
+            (i["name"], i["ticker"], i["cik"], i["sector"], i["country"])
+            for i in new_issuers
+        ])
 
-def generate_historical_prices(issuer_id, start_date, end_date, base_price, volatility):
+def generate_historical_prices(issuer_id, start_date, end_date, base_price, volatility, rng=RNG):
     """Generate historical price data"""
-    dates = []
-    prices = []
-    current_price = base_price
-    
-    current_date = start_date
-    while current_date <= end_date:
-        # Generate daily price movement
-        daily_return = np.random.normal(0, volatility)
-        current_price *= (1 + daily_return)
-        
-        # Add some noise
-        current_price += np.random.normal(0, base_price * 0.01)
-        
-        # Ensure positive price
-        current_price = max(current_price, base_price * 0.5)
-        
-        dates.append(current_date)
-        prices.append(current_price)
-        
-        current_date += timedelta(days=1)
+    dates = daily_dates(start_date, end_date)
+    n_days = len(dates)
+    
+    # Daily returns compound into the path; the noise and the floor apply per day
+    daily_returns = rng.normal(0, volatility, n_days)
+    noise = rng.normal(0, base_price * 0.01, n_days)
+    prices = np.maximum(base_price * np.cumprod(1 + daily_returns) + noise, base_price * 0.5)
     
     return dates, prices
 
+def generate_issuer_prices(task):
+    """Generate one issuer's OHLCV rows, ready for COPY"""
+    issuer_id, start_date, end_date, base_price, volatility, seed = task
+    rng = np.random.default_rng(seed)
+    
+    dates, prices = generate_historical_prices(issuer_id, start_date, end_date, base_price, volatility, rng)
+    
+    n_days = len(prices)
+    opens = prices * (1 + rng.normal(0, 0.01, n_days))
+    highs = prices * (1 + np.abs(rng.normal(0, 0.02, n_days)))
+    lows = prices * (1 - np.abs(rng.normal(0, 0.02, n_days)))
+    volumes = rng.uniform(1000000, 10000000, n_days).astype(np.int64)
+    
+    return list(zip(
+        [issuer_id] * n_days,
+        np.datetime_as_string(dates).tolist(),
+        opens.tolist(),
+        highs.tolist(),
+        lows.tolist(),
+        prices.tolist(),
+        volumes.tolist(),
+        prices.tolist()
+    ))
+
 def seed_price_data(db):
     """Seed price data for all issuers"""
     print("Seeding price data...")
     
-    issuers = db.execute(text("SELECT id, ticker FROM issuer")).fetchall()
+    issuers = db.execute(SELECT_ISSUER_SECTORS).fetchall()
     
     # Base prices for different sectors
     base_prices = {
@@ -125,48 +234,54 @@ def seed_price_data(db):
     start_date = datetime.now() - timedelta(days=365)
     end_date = datetime.now()
     
-    for issuer_id, ticker in issuers:
-        # Get sector
-        sector = db.execute(
-            text("SELECT sector FROM issuer WHERE id = :id"),
-            {"id": issuer_id}
-        ).fetchone()[0]
-        
-        base_price = base_prices.get(sector, 100.0)
-        volatility = volatilities.get(sector, 0.020)
-        
-        # Generate historical prices
-        dates, prices = generate_historical_prices(issuer_id, start_date, end_date, base_price, volatility)
-        
-        # Insert price data
-        for date, price in zip(dates, prices):
-            db.execute(
-                text("""
-                    INSERT INTO price (issuer_id, ts, open, high, low, close, volume, adj_close)
-                    VALUES (:issuer_id, :ts, :open, :high, :low, :close, :volume, :adj_close)
-                    ON CONFLICT (id, ts) DO NOTHING
-                """),
-                {
-                    "issuer_id": issuer_id,
-                    "ts": date,
-                    "open": price * (1 + np.random.normal(0, 0.01)),
-                    "high": price * (1 + abs(np.random.normal(0, 0.02))),
-                    "low": price * (1 - abs(np.random.normal(0, 0.02))),
-                    "close": price,
-                    "volume": int(np.random.uniform(1000000, 10000000)),
-                    "adj_close": price
-                }
-            )
-        
-        print(f"  Added price data for {ticker}: {len(prices)} days")
+    tasks = [
+        (issuer_id, start_date, end_date, base_prices.get(sector, 100.0), volatilities.get(sector, 0.020), seed)
+        for (issuer_id, _, sector), seed in zip(issuers, issuer_seeds(len(issuers)))
+    ]
+    
+    price_rows = []
+    for (_, ticker, _), rows in zip(issuers, map_issuers(generate_issuer_prices, tasks)):
+        price_rows.extend(rows)
+        print(f"  Generated price data for {ticker}: {len(rows)} days")
     
-    db.commit()
+    # Ids are serial, so the old ON CONFLICT (id, ts) never fired; a plain COPY is equivalent
+    copy_rows(
+        db, "price",
+        ("issuer_id", "ts", "open", "high", "low", "close", "volume", "adj_close"),
+        price_rows
+    )
+    print(f"  Copied {len(price_rows)} price rows")
+
+def generate_issuer_features(task):
+    """Generate one issuer's feature rows as a single (day, feature) block"""
+    issuer_id, ranges, market_ranges, dates, trend, seed = task
+    rng = np.random.default_rng(seed)
+    names = list(ranges) + list(market_ranges)
+    n_days = len(dates)
+    
+    # Midpoint plus trend plus noise, clipped to range
+    mins = np.array([low for low, _ in ranges.values()])
+    maxs = np.array([high for _, high in ranges.values()])
+    spans = maxs - mins
+    values = mins + spans * 0.5 + trend[:, None] * spans + rng.normal(0, spans * 0.1, (n_days, len(mins)))
+    np.clip(values, mins, maxs, out=values)
+    
+    market_lows = np.array([low for low, _ in market_ranges.values()])
+    market_highs = np.array([high for _, high in market_ranges.values()])
+    market = rng.uniform(market_lows, market_highs, (n_days, len(market_lows)))
+    block = np.hstack([values, market])
+    
+    return [
+        (issuer_id, date, name, value, 'demo')
+        for date, day_values in zip(dates, block.tolist())
+        for name, value in zip(names, day_values)
+    ]
 
 def seed_feature_data(db):
     """Seed feature data for all issuers"""
     print("Seeding feature data...")
     
-    issuers = db.execute(text("SELECT id, ticker, sector FROM issuer")).fetchall()
+    issuers = db.execute(SELECT_ISSUER_SECTORS).fetchall()
     
     # Feature ranges by sector
     feature_ranges = {
@@ -218,51 +333,31 @@ def seed_feature_data(db):
     end_date = datetime.now()
     start_date = end_date - timedelta(days=30)
     
-    for issuer_id, ticker, sector in issuers:
-        ranges = feature_ranges.get(sector, feature_ranges["Technology"])
-        
-        current_date = start_date
-        while current_date <= end_date:
-            # Generate features with some trend
-            features = {}
-            for feature_name, (min_val, max_val) in ranges.items():
-                # Add some trend over time
-                trend_factor = (current_date - start_date).days / 30.0
-                base_value = min_val + (max_val - min_val) * 0.5
-                trend = np.sin(trend_factor * np.pi) * 0.2  # Oscillating trend
-                
-                value = base_value + trend * (max_val - min_val) + np.random.normal(0, (max_val - min_val) * 0.1)
-                value = np.clip(value, min_val, max_val)
-                features[feature_name] = value
-            
-            # Add market features
-            features["vol_30d"] = np.random.uniform(0.15, 0.35)
-            features["max_drawdown_30d"] = np.random.uniform(0.05, 0.25)
-            features["beta_180d"] = np.random.uniform(0.8, 1.4)
-            features["avg_daily_volume"] = np.random.uniform(5000000, 50000000)
-            
-            # Insert features
-            for feature_name, value in features.items():
-                db.execute(
-                    text("""
-                        INSERT INTO feature_snapshot (issuer_id, ts, feature_name, value, source)
-                        VALUES (:issuer_id, :ts, :feature_name, :value, 'demo')
-                        ON CONFLICT (id, ts) DO UPDATE SET
-                        value = EXCLUDED.value, source = EXCLUDED.source
-                    """),
-                    {
-                        "issuer_id": issuer_id,
-                        "ts": current_date,
-                        "feature_name": feature_name,
-                        "value": float(value)
-                    }
-                )
-            
-            current_date += timedelta(days=1)
-        
-        print(f"  Added feature data for {ticker}: 30 days")
+    # Market features are drawn uniformly, independent of sector
+    market_ranges = {
+        "vol_30d": (0.15, 0.35),
+        "max_drawdown_30d": (0.05, 0.25),
+        "beta_180d": (0.8, 1.4),
+        "avg_daily_volume": (5000000, 50000000)
+    }
+    
+    dates = daily_dates(start_date, end_date).tolist()
+    n_days = len(dates)
+    trend = np.sin(np.arange(n_days) / 30.0 * np.pi) * 0.2  # Oscillating trend
+    
+    tasks = [
+        (issuer_id, feature_ranges.get(sector, feature_ranges["Technology"]), market_ranges, dates, trend, seed)
+        for (issuer_id, _, sector), seed in zip(issuers, issuer_seeds(len(issuers)))
+    ]
+    
+    feature_rows = []
+    for (_, ticker, _), rows in zip(issuers, map_issuers(generate_issuer_features, tasks)):
+        feature_rows.extend(rows)
+        print(f"  Generated feature data for {ticker}: {n_days} days")
     
-    db.commit()
+    cursor = db.connection().connection.cursor()
+    execute_values(cursor, INSERT_FEATURES, feature_rows, page_size=1000)
+    print(f"  Inserted {len(feature_rows)} feature rows")
 
 def seed_macro_data(db):
     """Seed macroeconomic data"""
@@ -279,35 +374,22 @@ def seed_macro_data(db):
         "gdp_growth": (1.5, 3.0)
     }
     
-    current_date = start_date
-    while current_date <= end_date:
-        for indicator, (min_val, max_val) in macro_indicators.items():
-            value = np.random.uniform(min_val, max_val)
-            
-            db.execute(
-                text("""
-                    INSERT INTO macro (ts, key, value, source)
-                    VALUES (:ts, :key, :value, 'demo')
-                    ON CONFLICT (id, ts) DO UPDATE SET
-                    value = EXCLUDED.value, source = EXCLUDED.source
-                """),
-                {
-                    "ts": current_date,
-                    "key": indicator,
-                    "value": float(value)
-                }
-            )
-        
-        current_date += timedelta(days=1)
+    macro_rows = [
+        (date, indicator, float(RNG.uniform(min_val, max_val)), 'demo')
+        for date in daily_dates(start_date, end_date).tolist()
+        for indicator, (min_val, max_val) in macro_indicators.items()
+    ]
+    
+    cursor = db.connection().connection.cursor()
+    execute_values(cursor, INSERT_MACRO, macro_rows, page_size=1000)
     
     print("  Added macro data: 30 days")
-    db.commit()
 
 def seed_sample_events(db):
     """Seed sample events"""
     print("Seeding sample events...")
     
-    issuers = db.execute(text("SELECT id, name, ticker FROM issuer")).fetchall()
+    issuers = db.execute(SELECT_ISSUER_NAMES).fetchall()
     
     # Sample events
     sample_events = [
@@ -347,48 +429,43 @@ def seed_sample_events(db):
     end_date = datetime.now()
     start_date = end_date - timedelta(days=7)
     
+    event_rows = []
     for issuer_id, name, ticker in issuers:
         # Add 1-3 random events per issuer
-        num_events = np.random.randint(1, 4)
+        num_events = int(RNG.integers(1, 4))
         
         for i in range(num_events):
-            event = random.choice(sample_events)
+            event = sample_events[RNG.integers(len(sample_events))]
             event_date = start_date + timedelta(
-                days=np.random.randint(0, 7),
-                hours=np.random.randint(0, 24)
+                days=int(RNG.integers(0, 7)),
+                hours=int(RNG.integers(0, 24))
             )
             
             # Customize headline
             headline = event["headline"].replace("Company", name)
             
-            db.execute(
-                text("""
-                    INSERT INTO event (issuer_id, ts, type, sentiment, weight, headline, url, raw_hash, source)
-                    VALUES (:issuer_id, :ts, :type, :sentiment, :weight, :headline, :url, :hash, :source)
-                    ON CONFLICT (id, ts) DO NOTHING
-                """),
-                {
-                    "issuer_id": issuer_id,
-                    "ts": event_date,
-                    "type": event["type"],
-                    "sentiment": event["sentiment"],
-                    "weight": event["weight"],
-                    "headline": headline,
-                    "url": f"https://example.com/news/{ticker.lower()}-{i}",
-                    "hash": f"demo_event_{issuer_id}_{i}_{event_date.strftime('%Y%m%d')}",
-                    "source": "demo"
-                }
-            )
+            event_rows.append((
+                issuer_id,
+                event_date,
+                event["type"],
+                event["sentiment"],
+                event["weight"],
+                headline,
+                f"https://example.com/news/{ticker.lower()}-{i}",
+                f"demo_event_{issuer_id}_{i}_{event_date.strftime('%Y%m%d')}",
+                "demo"
+            ))
         
         print(f"  Added {num_events} events for {ticker}")
     
-    db.commit()
+    cursor = db.connection().connection.cursor()
+    execute_values(cursor, INSERT_EVENTS, event_rows, page_size=500)
 
 def seed_initial_scores(db):
     """Seed initial credit scores"""
     print("Seeding initial credit scores...")
     
-    issuers = db.execute(text("SELECT id, ticker, sector FROM issuer")).fetchall()
+    issuers = db.execute(SELECT_ISSUER_SECTORS).fetchall()
     
     # Base scores by sector
     sector_base_scores = {
@@ -400,11 +477,13 @@ def seed_initial_scores(db):
         "Consumer Discretionary": 68.0
     }
     
+    now = datetime.now()
+    score_rows = []
     for issuer_id, ticker, sector in issuers:
         base_score = sector_base_scores.get(sector, 70.0)
         
         # Add some variation
-        score = base_score + np.random.normal(0, 10.0)
+        score = base_score + RNG.normal(0, 10.0)
         score = np.clip(score, 30.0, 95.0)
         
         # Determine bucket
@@ -426,51 +505,56 @@ def seed_initial_scores(db):
         # Generate explanation
         explanation = {
             "top_features": [
-                {"name": "icr", "impact": np.random.uniform(-5, 5)},
-                {"name": "debt_to_ebitda", "impact": np.random.uniform(-3, 3)},
-                {"name": "vol_30d", "impact": np.random.uniform(-2, 2)}
+                {"name": "icr", "impact": RNG.uniform(-5, 5)},
+                {"name": "debt_to_ebitda", "impact": RNG.uniform(-3, 3)},
+                {"name": "vol_30d", "impact": RNG.uniform(-2, 2)}
             ],
             "events": [],
             "summary": f"Initial score for {ticker} based on fundamental analysis."
         }
         
-        db.execute(
-            text("""
-                INSERT INTO score (issuer_id, ts, score, bucket, base, market, event_delta, macro_adj, model_version, explanation)
-                VALUES (:issuer_id, :ts, :score, :bucket, :base, :market, :event_delta, :macro_adj, :model_version, :explanation)
-            """),
-            {
-                "issuer_id": issuer_id,
-                "ts": datetime.now(),
-                "score": float(score),
-                "bucket": bucket,
-                "base": float(score * 0.6),
-                "market": float(score * 0.2),
-                "event_delta": float(score * 0.1),
-                "macro_adj": float(score * 0.1),
-                "model_version": "v1.0",
-                "explanation": json.dumps(explanation)
-            }
-        )
+        score_rows.append((
+            issuer_id,
+            now,
+            float(score),
+            bucket,
+            float(score * 0.6),
+            float(score * 0.2),
+            float(score * 0.1),
+            float(score * 0.1),
+            "v1.0",
+            Json(explanation)
+        ))
         
         print(f"  Added initial score for {ticker}: {score:.1f} ({bucket})")
     
-    db.commit()
+    cursor = db.connection().connection.cursor()
+    execute_values(cursor, INSERT_SCORES, score_rows, template="(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s::jsonb)", page_size=500)
 
 def main():
     """Main seeding function"""
+    parser = argparse.ArgumentParser(description="Seed the database with demo data")
+    parser.add_argument("--fast", action="store_true",
+                        help="Drop price/feature indexes during the load and rebuild them afterwards")
+    args = parser.parse_args()
+    
     print("Starting demo data seeding...")
     
     try:
         db = get_db_session()
         
-        # Seed data in order
-        seed_issuers(db)
-        seed_price_data(db)
-        seed_feature_data(db)
-        seed_macro_data(db)
-        seed_sample_events(db)
-        seed_initial_scores(db)
+        # Seed data in order, committing once at the end; a failure also restores dropped indexes
+        with db.begin():
+            if args.fast:
+                seed_prepare(db)
+            seed_issuers(db)
+            seed_price_data(db)
+            seed_feature_data(db)
+            seed_macro_data(db)
+            seed_sample_events(db)
+            seed_initial_scores(db)
+            if args.fast:
+                seed_finalize(db)
         
         print("\nDemo data seeding completed successfully!")
         print(f"Added {len(SAMPLE_ISSUERS)} issuers with historical data")
@@ -0,0 +1,59 @@
+import pytest
+import pytest_asyncio
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import event
+
+from routers import issuers
+from services.db import AsyncSessionLocal, get_engine, ping_db
+
+MAX_ISSUER_LIST_STATEMENTS = 3
+
+@pytest_asyncio.fixture
+async def client():
+    """Client for an app serving only the issuers router (requires running database)"""
+    # Each test gets its own event loop; pooled asyncpg connections are bound to
+    # the loop that opened them, so the pool is emptied when the test ends
+    try:
+        try:
+            await ping_db()
+        except Exception:
+            pytest.skip("Database not available")
+
+        app = FastAPI()
+        app.include_router(issuers.router, prefix="/api/v1")
+        app.state.sessionmaker = AsyncSessionLocal
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            yield client
+    finally:
+        await get_engine().dispose()
+
+@pytest.fixture
+def statements():
+    """SQL statements sent to the database while the test runs"""
+    executed = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    engine = get_engine().sync_engine
+    event.listen(engine, "before_cursor_execute", count)
+    yield executed
+    event.remove(engine, "before_cursor_execute", count)
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit", [1, 10, 1000])
+async def test_list_issuers_statement_count(client, statements, limit):
+    """/issuers must not issue per-issuer queries, whatever the page size"""
+    response = await client.get("/api/v1/issuers", params={"limit": limit})
+
+    assert response.status_code == 200
+    assert len(statements) <= MAX_ISSUER_LIST_STATEMENTS, statements
+
+if __name__ == "__main__":
+    pytest.main([__file__])
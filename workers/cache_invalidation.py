@@ -0,0 +1,25 @@
+import redis
+import structlog
+
+from celery_app import REDIS_URL
+
+logger = structlog.get_logger()
+
+# Mirrors the key layout of api/services/response_cache.py
+VERSION_PREFIX = "respcache:version"
+NS_SCORES = "scores"
+NS_EVENTS = "events"
+
+_redis = redis.Redis.from_url(REDIS_URL)
+
+
+def invalidate_response_cache(*namespaces: str):
+    """Mark the API's cached responses in the given namespaces as stale"""
+    # One INCR per namespace; the API compares each entry's build-time version
+    try:
+        pipe = _redis.pipeline(transaction=False)
+        for namespace in namespaces:
+            pipe.incr(f"{VERSION_PREFIX}:{namespace}")
+        pipe.execute()
+    except Exception as e:
+        logger.warning("Response cache invalidation failed", namespaces=namespaces, error=str(e))
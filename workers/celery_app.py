@@ -5,17 +5,21 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Shared by the broker, the result backend and workers/cache_invalidation.py
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
+
 # Celery configuration
 celery_app = Celery(
     "credtech_workers",
-    broker=os.getenv("REDIS_URL", "redis://redis:6379/0"),
-    backend=os.getenv("REDIS_URL", "redis://redis:6379/0"),
+    broker=REDIS_URL,
+    backend=REDIS_URL,
     include=[
         "tasks_ingest_structured",
         "tasks_ingest_unstructured", 
         "tasks_score_compute",
         "tasks_ingest_yfinance",
-        "tasks_ingest_news_rss"
+        "tasks_ingest_news_rss",
+        "tasks_alerts"
     ]
 )
 
@@ -33,8 +37,21 @@ celery_app.conf.update(
     worker_max_tasks_per_child=1000,
     broker_connection_retry_on_startup=True,
     result_expires=3600,  # 1 hour
+    # Score results carry explanation payloads; compress them on the wire
+    task_compression="gzip",
+    result_compression="gzip",
+    broker_pool_limit=10,
+    result_backend_transport_options={"socket_keepalive": True},
 )
 
+# Periodic tasks, sent by the single-replica beat service in docker-compose.yml
+celery_app.conf.beat_schedule = {
+    "refresh-latest-score-view": {
+        "task": "refresh_latest_score_view",
+        "schedule": 60.0,
+    },
+}
+
 # Task routing
 celery_app.conf.task_routes = {
     "tasks_ingest_structured.*": {"queue": "structured"},
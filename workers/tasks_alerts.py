@@ -0,0 +1,108 @@
+import os
+import smtplib
+from email.message import EmailMessage
+from typing import Any, Dict
+
+import requests
+import structlog
+from dotenv import load_dotenv
+
+from celery_app import celery_app
+
+# Load environment variables
+load_dotenv()
+
+logger = structlog.get_logger()
+
+SMTP_HOST = os.getenv("SMTP_HOST")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "25"))
+SMTP_FROM = os.getenv("SMTP_FROM", "alerts@blackswan.local")
+WEBHOOK_TIMEOUT = 10
+
+
+def send_webhook(url: str, payload: Dict[str, Any]):
+    """POST the alert payload to a subscriber webhook"""
+    response = requests.post(url, json=payload, timeout=WEBHOOK_TIMEOUT)
+    response.raise_for_status()
+
+
+def send_email(to_address: str, payload: Dict[str, Any]):
+    """Send the alert by email when an SMTP relay is configured"""
+    if not SMTP_HOST:
+        logger.warning("SMTP_HOST not configured, skipping email alert", to=to_address)
+        return
+
+    message = EmailMessage()
+    message["From"] = SMTP_FROM
+    message["To"] = to_address
+    message["Subject"] = f"[BlackSwan] {payload['alert_type']} alert for {payload['issuer_name']}"
+    message.set_content(payload["message"] or "")
+
+    with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=WEBHOOK_TIMEOUT) as smtp:
+        smtp.send_message(message)
+
+
+def _webhook_error_is_transient(error: Exception) -> bool:
+    """Connection failures, timeouts, 429 and 5xx responses are worth retrying; other 4xx are not"""
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return False
+
+
+def _smtp_error_is_transient(error: Exception) -> bool:
+    """Dropped connections and 4xx SMTP replies are temporary; 5xx replies are permanent"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, (smtplib.SMTPServerDisconnected, OSError))
+
+
+@celery_app.task(name="send_alert")
+def send_alert(subscription_id: int, payload: Dict[str, Any]):
+    """
+    Deliver an already-recorded alert to a subscription's webhook and/or email.
+    
+    Each channel is sent by its own task, so a retry on one never re-sends the other.
+    """
+    if payload.get("webhook_url"):
+        send_alert_webhook.delay(subscription_id, payload)
+    if payload.get("email"):
+        send_alert_email.delay(subscription_id, payload)
+
+    return {"status": "queued", "subscription_id": subscription_id}
+
+
+@celery_app.task(bind=True, name="send_alert_webhook", max_retries=3, default_retry_delay=30)
+def send_alert_webhook(self, subscription_id: int, payload: Dict[str, Any]):
+    """Deliver an alert to the subscription's webhook, retrying transient failures"""
+    try:
+        send_webhook(payload["webhook_url"], payload)
+    except Exception as e:
+        if not _webhook_error_is_transient(e):
+            logger.error("Alert webhook rejected", error=str(e), subscription_id=subscription_id)
+            raise
+        logger.warning("Alert webhook failed, retrying", error=str(e), subscription_id=subscription_id)
+        raise self.retry(exc=e)
+
+    logger.info("Alert delivered", channel="webhook", subscription_id=subscription_id, alert_id=payload.get("alert_id"))
+    return {"status": "success", "channel": "webhook", "subscription_id": subscription_id}
+
+
+@celery_app.task(bind=True, name="send_alert_email", max_retries=3, default_retry_delay=30)
+def send_alert_email(self, subscription_id: int, payload: Dict[str, Any]):
+    """Deliver an alert to the subscription's email address, retrying transient failures"""
+    try:
+        send_email(payload["email"], payload)
+    except Exception as e:
+        if not _smtp_error_is_transient(e):
+            logger.error("Alert email rejected", error=str(e), subscription_id=subscription_id)
+            raise
+        logger.warning("Alert email failed, retrying", error=str(e), subscription_id=subscription_id)
+        raise self.retry(exc=e)
+
+    logger.info("Alert delivered", channel="email", subscription_id=subscription_id, alert_id=payload.get("alert_id"))
+    return {"status": "success", "channel": "email", "subscription_id": subscription_id}
@@ -2,6 +2,7 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from functools import lru_cache
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 import structlog
@@ -17,12 +18,16 @@ load_dotenv()
 logger = structlog.get_logger()
 
 # Database connection
+# Engine and session factory are built once per process, on first use
+@lru_cache(maxsize=1)
+def get_sessionmaker():
+    database_url = f"postgresql://{os.getenv('POSTGRES_USER', 'credtech')}:{os.getenv('POSTGRES_PASSWORD', 'credtech_pass')}@{os.getenv('POSTGRES_HOST', 'postgres')}:{os.getenv('POSTGRES_PORT', '5432')}/{os.getenv('POSTGRES_DB', 'credtech')}"
+    engine = create_engine(database_url, pool_size=5, max_overflow=0, pool_pre_ping=True)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
 def get_db_session():
     """Get database session"""
-    database_url = f"postgresql://{os.getenv('POSTGRES_USER', 'credtech')}:{os.getenv('POSTGRES_PASSWORD', 'credtech_pass')}@{os.getenv('POSTGRES_HOST', 'postgres')}:{os.getenv('POSTGRES_PORT', '5432')}/{os.getenv('POSTGRES_DB', 'credtech')}"
-    engine = create_engine(database_url)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    return SessionLocal()
+    return get_sessionmaker()()
 
 @celery_app.task(bind=True, name="ingest_yahoo_finance")
 def ingest_yahoo_finance(self, ticker: str):
@@ -1,15 +1,18 @@
+import bisect
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
+from functools import lru_cache
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 import structlog
-from celery import current_task
+from celery import chord, current_task
 import os
 from dotenv import load_dotenv
 import json
 
 from celery_app import celery_app
+from cache_invalidation import invalidate_response_cache, NS_SCORES
 
 # Load environment variables
 load_dotenv()
@@ -17,12 +20,16 @@ load_dotenv()
 logger = structlog.get_logger()
 
 # Database connection
+# Engine and session factory are built once per process, on first use
+@lru_cache(maxsize=1)
+def get_sessionmaker():
+    database_url = f"postgresql://{os.getenv('POSTGRES_USER', 'credtech')}:{os.getenv('POSTGRES_PASSWORD', 'credtech_pass')}@{os.getenv('POSTGRES_HOST', 'postgres')}:{os.getenv('POSTGRES_PORT', '5432')}/{os.getenv('POSTGRES_DB', 'credtech')}"
+    engine = create_engine(database_url, pool_size=5, max_overflow=0, pool_pre_ping=True)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
 def get_db_session():
     """Get database session"""
-    database_url = f"postgresql://{os.getenv('POSTGRES_USER', 'credtech')}:{os.getenv('POSTGRES_PASSWORD', 'credtech_pass')}@{os.getenv('POSTGRES_HOST', 'postgres')}:{os.getenv('POSTGRES_PORT', '5432')}/{os.getenv('POSTGRES_DB', 'credtech')}"
-    engine = create_engine(database_url)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    return SessionLocal()
+    return get_sessionmaker()()
 
 # Scoring weights (from settings)
 SCORING_WEIGHTS = {
@@ -36,22 +43,13 @@ def sigmoid(x):
     """Sigmoid function for score normalization"""
     return 1 / (1 + np.exp(-x))
 
+# Lower bounds of each bucket above the floor; bisect_right picks the bucket
+_BUCKET_CUTS = (30, 50, 60, 70, 80, 90)
+_BUCKET_NAMES = ("CC", "CCC", "B", "BB", "BBB", "AA", "AAA")
+
 def get_score_bucket(score: float) -> str:
     """Map score to rating bucket"""
-    if score >= 90:
-        return "AAA"
-    elif score >= 80:
-        return "AA"
-    elif score >= 70:
-        return "BBB"
-    elif score >= 60:
-        return "BB"
-    elif score >= 50:
-        return "B"
-    elif score >= 30:
-        return "CCC"
-    else:
-        return "CC"
+    return _BUCKET_NAMES[bisect.bisect_right(_BUCKET_CUTS, score)]
 
 def normalize_feature(value: float, feature_name: str) -> float:
     """Normalize feature values to [-1, 1] range"""
@@ -356,9 +354,11 @@ def generate_explanation(base_contributions, market_contributions, event_contrib
         }
 
 @celery_app.task(bind=True, name="compute_issuer_score")
-def compute_issuer_score(self, issuer_id: int):
+def compute_issuer_score(self, issuer_id: int, invalidate_cache: bool = True):
     """
     Compute credit score for a specific issuer.
+    
+    Batch callers pass invalidate_cache=False and invalidate once when the batch is done.
     """
     try:
         logger.info("Starting score computation", issuer_id=issuer_id)
@@ -425,6 +425,8 @@ def compute_issuer_score(self, issuer_id: int):
         
         db.commit()
         db.close()
+        if invalidate_cache:
+            invalidate_response_cache(NS_SCORES)
         
         logger.info("Score computation completed", 
                    issuer_id=issuer_id, 
@@ -467,16 +469,20 @@ def compute_all_scores(self):
             text("SELECT id FROM issuer")
         ).fetchall()
         
-        results = []
-        for issuer in issuers:
-            try:
-                result = compute_issuer_score.delay(issuer[0])
-                results.append({"issuer_id": issuer[0], "task_id": result.id})
-            except Exception as e:
-                logger.error("Failed to queue score computation", error=str(e), issuer_id=issuer[0])
-        
         db.close()
         
+        # The API's score responses are invalidated once, after every issuer is
+        # scored. If a task fails the chord body is skipped, and the per-minute
+        # refresh_latest_score_view invalidation catches up.
+        header = [compute_issuer_score.s(issuer[0], invalidate_cache=False) for issuer in issuers]
+        # Freezing assigns the task ids the chord will use
+        results = [
+            {"issuer_id": issuer[0], "task_id": signature.freeze().id}
+            for issuer, signature in zip(issuers, header)
+        ]
+        if header:
+            chord(header)(invalidate_scores_cache.si())
+        
         logger.info("Queued score computation tasks", count=len(results))
         return {"status": "success", "tasks_queued": len(results), "results": results}
         
@@ -484,6 +490,31 @@ def compute_all_scores(self):
         logger.error("Failed to queue score computations", error=str(e))
         raise
 
+@celery_app.task(name="invalidate_scores_cache")
+def invalidate_scores_cache():
+    """
+    Mark the API's cached score responses stale after a batch of score writes.
+    """
+    invalidate_response_cache(NS_SCORES)
+
+@celery_app.task(bind=True, name="refresh_latest_score_view")
+def refresh_latest_score_view(self):
+    """
+    Refresh the mv_latest_score materialized view.
+    """
+    try:
+        db = get_db_session()
+        db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_latest_score"))
+        db.commit()
+        db.close()
+        
+        invalidate_response_cache(NS_SCORES)
+        return {"status": "success"}
+        
+    except Exception as e:
+        logger.error("Failed to refresh latest score view", error=str(e))
+        raise
+
 @celery_app.task(bind=True, name="schedule_score_computation")
 def schedule_score_computation(self):
     """